@@ -1,5 +1,6 @@
 import asyncio
 import os
+import re
 import sys
 from logging.config import fileConfig
 
@@ -21,12 +22,20 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+TASK_PARTITION = re.compile(r"tasks_p\d+")
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Hash partitions of tasks exist only in migrations, not as models.
+    return not (type_ == "table" and reflected and TASK_PARTITION.fullmatch(name))
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -44,7 +53,11 @@ async def run_migrations_online() -> None:
 
     async with connectable.connect() as connection:
         def do_run_migrations(sync_connection) -> None:
-            context.configure(connection=sync_connection, target_metadata=target_metadata)
+            context.configure(
+                connection=sync_connection,
+                target_metadata=target_metadata,
+                include_object=include_object,
+            )
             with context.begin_transaction():
                 context.run_migrations()
 
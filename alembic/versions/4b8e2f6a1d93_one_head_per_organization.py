@@ -0,0 +1,50 @@
+"""one head per organization: partial unique index on teams
+
+Revision ID: 4b8e2f6a1d93
+Revises: e1d7b4c9a835
+Create Date: 2026-10-17 18:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = '4b8e2f6a1d93'
+down_revision = 'e1d7b4c9a835'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT organization_id FROM teams WHERE position = 'head' "
+            'GROUP BY organization_id HAVING count(*) > 1'
+        )
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f'Organizations with more than one head: {sorted(duplicates)}; '
+            'demote the extra heads before upgrading.'
+        )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'teams_one_head_per_org',
+            'teams',
+            ['organization_id'],
+            unique=True,
+            postgresql_where=sa.text("position = 'head'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'teams_one_head_per_org',
+            table_name='teams',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,27 @@
+"""add users.token_version
+
+Revision ID: 7c2e4d1a9b60
+Revises: 355fa847a82f
+Create Date: 2026-10-16 09:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = '7c2e4d1a9b60'
+down_revision = '355fa847a82f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
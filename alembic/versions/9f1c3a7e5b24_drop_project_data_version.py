@@ -0,0 +1,27 @@
+"""drop projects.data_version: task list ETags use organizations.data_version
+
+Revision ID: 9f1c3a7e5b24
+Revises: 4b8e2f6a1d93
+Create Date: 2026-10-17 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = '9f1c3a7e5b24'
+down_revision = '4b8e2f6a1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_column('projects', 'data_version')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'projects',
+        sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
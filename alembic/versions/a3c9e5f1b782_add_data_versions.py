@@ -0,0 +1,29 @@
+"""add organizations.data_version / projects.data_version
+
+Revision ID: a3c9e5f1b782
+Revises: f7b3d2a9c614
+Create Date: 2026-10-16 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'a3c9e5f1b782'
+down_revision = 'f7b3d2a9c614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ('organizations', 'projects'):
+        op.add_column(
+            table,
+            sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in ('projects', 'organizations'):
+        op.drop_column(table, 'data_version')
@@ -0,0 +1,61 @@
+"""one organization per user: unique teams.user_id
+
+Revision ID: a6f3c8e2d571
+Revises: c2e7a9d4b516
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'a6f3c8e2d571'
+down_revision = 'c2e7a9d4b516'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text('SELECT user_id FROM teams GROUP BY user_id HAVING count(*) > 1')
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f'Users in more than one organization: {sorted(duplicates)}; '
+            'remove the extra memberships before upgrading.'
+        )
+    # Build the unique index without locking writes, then attach it as the
+    # constraint; it replaces ix_teams_user_id for lookups by user.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'teams_user_id_unique',
+            'teams',
+            ['user_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(
+        'ALTER TABLE teams ADD CONSTRAINT teams_user_id_unique '
+        'UNIQUE USING INDEX teams_user_id_unique'
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_teams_user_id',
+            table_name='teams',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_teams_user_id',
+            'teams',
+            ['user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.drop_constraint('teams_user_id_unique', 'teams', type_='unique')
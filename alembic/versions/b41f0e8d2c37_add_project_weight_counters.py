@@ -0,0 +1,62 @@
+"""add projects.total_weight / completed_weight
+
+Revision ID: b41f0e8d2c37
+Revises: 7c2e4d1a9b60
+Create Date: 2026-10-16 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'b41f0e8d2c37'
+down_revision = '7c2e4d1a9b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'projects',
+        sa.Column('total_weight', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'projects',
+        sa.Column('completed_weight', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE projects AS p
+        SET total_weight = agg.total_weight,
+            completed_weight = agg.completed_weight,
+            project_progress = CASE
+                WHEN agg.total_weight > 0
+                THEN agg.completed_weight * 100 / agg.total_weight
+                ELSE 0
+            END
+        FROM (
+            SELECT organization_name,
+                   project_id,
+                   SUM(w) AS total_weight,
+                   COALESCE(SUM(w) FILTER (WHERE task_completed), 0) AS completed_weight
+            FROM (
+                SELECT organization_name, project_id, task_completed,
+                       CASE task_importance
+                           WHEN 'high' THEN 3
+                           WHEN 'medium' THEN 2
+                           ELSE 1
+                       END AS w
+                FROM tasks
+            ) AS weighted
+            GROUP BY organization_name, project_id
+        ) AS agg
+        WHERE p.organization_name = agg.organization_name
+          AND p.project_id = agg.project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'completed_weight')
+    op.drop_column('projects', 'total_weight')
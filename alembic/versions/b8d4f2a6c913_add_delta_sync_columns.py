@@ -0,0 +1,70 @@
+"""add updated_at / change_version and tombstones for delta sync
+
+Revision ID: b8d4f2a6c913
+Revises: a3c9e5f1b782
+Create Date: 2026-10-16 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'b8d4f2a6c913'
+down_revision = 'a3c9e5f1b782'
+branch_labels = None
+depends_on = None
+
+# Table -> primary key columns following (organization_id, change_version)
+# in the sync index.
+SYNC_TABLES = {
+    'teams': ['member_id'],
+    'projects': ['project_id'],
+    'tasks': ['project_id', 'task_id'],
+}
+
+
+def upgrade() -> None:
+    for table, keys in SYNC_TABLES.items():
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        )
+        op.add_column(
+            table,
+            sa.Column('change_version', sa.BigInteger(), server_default='0', nullable=False),
+        )
+        # Existing rows are version 0: every client's first sync returns them.
+        op.execute(f'UPDATE {table} SET updated_at = created_at')
+        op.create_index(
+            f'ix_{table}_org_change_version',
+            table,
+            ['organization_id', 'change_version', *keys],
+        )
+
+    op.create_table('tombstones',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('resource', sa.String(length=20), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('change_version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint("resource IN ('project', 'task')", name='tombstones_resource_check'),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_tombstones_org_change_version',
+        'tombstones',
+        ['organization_id', 'change_version', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_org_change_version', table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in SYNC_TABLES:
+        op.drop_index(f'ix_{table}_org_change_version', table_name=table)
+        op.drop_column(table, 'change_version')
+        op.drop_column(table, 'updated_at')
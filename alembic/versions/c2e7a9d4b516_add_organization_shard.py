@@ -0,0 +1,25 @@
+"""add organizations.shard for tenant sharding
+
+Revision ID: c2e7a9d4b516
+Revises: b8d4f2a6c913
+Create Date: 2026-10-16 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'c2e7a9d4b516'
+down_revision = 'b8d4f2a6c913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL: the organization lives on the default shard (DATABASE_URL).
+    op.add_column('organizations', sa.Column('shard', sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'shard')
@@ -0,0 +1,51 @@
+"""add tenancy hot-path indexes
+
+Revision ID: d93a5b7e1f24
+Revises: b41f0e8d2c37
+Create Date: 2026-10-16 11:20:00.000000
+
+"""
+from alembic import op
+
+
+
+revision = 'd93a5b7e1f24'
+down_revision = 'b41f0e8d2c37'
+branch_labels = None
+depends_on = None
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so every
+# statement runs in an autocommit block and does not lock writes.
+INDEXES = [
+    ('ix_teams_user_id', 'teams', ['user_id']),
+    ('ix_teams_org_position', 'teams', ['organization_name', 'position']),
+    (
+        'ix_tasks_org_project_assignee',
+        'tasks',
+        ['organization_name', 'project_id', 'task_assigned_to'],
+    ),
+    ('ix_tasks_org_assignee', 'tasks', ['organization_name', 'task_assigned_to']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,50 @@
+"""replace users.token_version with users.tokens_valid_after
+
+Revision ID: e1d7b4c9a835
+Revises: a6f3c8e2d571
+Create Date: 2026-10-17 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'e1d7b4c9a835'
+down_revision = 'a6f3c8e2d571'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tokens issued under token_version carry no iat claim, so their org
+    # claims are no longer trusted; they fall back to the principal lookup.
+    op.add_column(
+        'users',
+        sa.Column('tokens_valid_after', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.drop_column('users', 'token_version')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_tokens_valid_after',
+            'users',
+            ['tokens_valid_after'],
+            postgresql_where=sa.text('tokens_valid_after IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_tokens_valid_after',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.drop_column('users', 'tokens_valid_after')
@@ -0,0 +1,126 @@
+"""add organizations table with integer tenant key
+
+Revision ID: e5a81c4f6d02
+Revises: d93a5b7e1f24
+Create Date: 2026-10-16 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'e5a81c4f6d02'
+down_revision = 'd93a5b7e1f24'
+branch_labels = None
+depends_on = None
+
+TENANT_TABLES = ('teams', 'projects', 'tasks')
+
+
+def _swap_tenant_key(old_column: str, new_column: str) -> None:
+    """Drop every key built on ``old_column`` and rebuild it on ``new_column``."""
+    op.drop_constraint('tasks_project_fk', 'tasks', type_='foreignkey')
+    op.drop_constraint('tasks_assignee_fk', 'tasks', type_='foreignkey')
+    op.drop_index('ix_tasks_org_project_assignee', table_name='tasks', if_exists=True)
+    op.drop_index('ix_tasks_org_assignee', table_name='tasks', if_exists=True)
+    op.drop_index('ix_teams_org_position', table_name='teams', if_exists=True)
+    op.drop_constraint('tasks_pkey', 'tasks', type_='primary')
+    op.drop_constraint('teams_pkey', 'teams', type_='primary')
+    op.drop_constraint('projects_pkey', 'projects', type_='primary')
+    op.drop_constraint('teams_org_email_unique', 'teams', type_='unique')
+    op.drop_constraint('projects_org_name_unique', 'projects', type_='unique')
+    for table in TENANT_TABLES:
+        op.drop_column(table, old_column)
+
+    op.create_primary_key('teams_pkey', 'teams', [new_column, 'member_id'])
+    op.create_primary_key('projects_pkey', 'projects', [new_column, 'project_id'])
+    op.create_primary_key('tasks_pkey', 'tasks', [new_column, 'project_id', 'task_id'])
+    op.create_unique_constraint('teams_org_email_unique', 'teams', [new_column, 'email'])
+    op.create_unique_constraint(
+        'projects_org_name_unique', 'projects', [new_column, 'project_name']
+    )
+    op.create_foreign_key(
+        'tasks_project_fk',
+        'tasks',
+        'projects',
+        [new_column, 'project_id'],
+        [new_column, 'project_id'],
+        ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'tasks_assignee_fk',
+        'tasks',
+        'teams',
+        [new_column, 'task_assigned_to'],
+        [new_column, 'member_id'],
+        ondelete='RESTRICT',
+    )
+    op.create_index('ix_teams_org_position', 'teams', [new_column, 'position'])
+    op.create_index(
+        'ix_tasks_org_project_assignee',
+        'tasks',
+        [new_column, 'project_id', 'task_assigned_to'],
+    )
+    op.create_index('ix_tasks_org_assignee', 'tasks', [new_column, 'task_assigned_to'])
+
+
+def upgrade() -> None:
+    op.create_table('organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.execute(
+        """
+        INSERT INTO organizations (name)
+        SELECT organization_name FROM teams
+        UNION SELECT organization_name FROM projects
+        UNION SELECT organization_name FROM tasks
+        """
+    )
+    for table in TENANT_TABLES:
+        op.add_column(table, sa.Column('organization_id', sa.Integer(), nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table} SET organization_id = organizations.id
+            FROM organizations
+            WHERE organizations.name = {table}.organization_name
+            """
+        )
+        op.alter_column(table, 'organization_id', nullable=False)
+
+    _swap_tenant_key('organization_name', 'organization_id')
+
+    for table in ('teams', 'projects'):
+        op.create_foreign_key(
+            f'{table}_organization_id_fkey',
+            table,
+            'organizations',
+            ['organization_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+
+def downgrade() -> None:
+    for table in ('teams', 'projects'):
+        op.drop_constraint(f'{table}_organization_id_fkey', table, type_='foreignkey')
+
+    for table in TENANT_TABLES:
+        op.add_column(
+            table, sa.Column('organization_name', sa.String(length=100), nullable=True)
+        )
+        op.execute(
+            f"""
+            UPDATE {table} SET organization_name = organizations.name
+            FROM organizations
+            WHERE organizations.id = {table}.organization_id
+            """
+        )
+        op.alter_column(table, 'organization_name', nullable=False)
+
+    _swap_tenant_key('organization_id', 'organization_name')
+    op.drop_table('organizations')
@@ -0,0 +1,84 @@
+"""hash-partition tasks by organization_id
+
+Revision ID: f7b3d2a9c614
+Revises: e5a81c4f6d02
+Create Date: 2026-10-16 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision = 'f7b3d2a9c614'
+down_revision = 'e5a81c4f6d02'
+branch_labels = None
+depends_on = None
+
+# Frozen here on purpose: changing the modulus means re-running a migration
+# like this one, not editing app.database.models.TASK_PARTITIONS.
+PARTITIONS = 16
+
+COLUMNS = (
+    'organization_id, project_id, task_id, task_description, task_deadline, '
+    'task_assigned_to, task_importance, task_completed, created_at'
+)
+
+INDEXES = [
+    ('ix_tasks_org_project_assignee', ['organization_id', 'project_id', 'task_assigned_to']),
+    ('ix_tasks_org_assignee', ['organization_id', 'task_assigned_to']),
+]
+
+
+def _create_tasks_table(**kw) -> None:
+    op.create_table('tasks',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), server_default=sa.text("nextval('tasks_task_id_seq'::regclass)"), nullable=False),
+    sa.Column('task_description', sa.Text(), nullable=False),
+    sa.Column('task_deadline', sa.Date(), nullable=True),
+    sa.Column('task_assigned_to', sa.Integer(), nullable=False),
+    sa.Column('task_importance', sa.String(length=50), nullable=True),
+    sa.Column('task_completed', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint("task_importance IN ('high', 'medium', 'low') OR task_importance IS NULL", name='tasks_importance_check'),
+    sa.ForeignKeyConstraint(['organization_id', 'project_id'], ['projects.organization_id', 'projects.project_id'], name='tasks_project_fk', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['organization_id', 'task_assigned_to'], ['teams.organization_id', 'teams.member_id'], name='tasks_assignee_fk', ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('organization_id', 'project_id', 'task_id', name='tasks_pkey'),
+    **kw
+    )
+
+
+def _rebuild_tasks(**kw) -> None:
+    """Recreate ``tasks`` (optionally partitioned) and move the rows across.
+
+    Postgres cannot change a table's partitioning in place, so the old table
+    is renamed aside, copied and dropped; the task_id sequence is kept.
+    """
+    op.rename_table('tasks', 'tasks_old')
+    op.execute('ALTER INDEX tasks_pkey RENAME TO tasks_old_pkey')
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='tasks_old', if_exists=True)
+    op.execute('ALTER SEQUENCE tasks_task_id_seq OWNED BY NONE')
+
+    _create_tasks_table(**kw)
+    if kw:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f'CREATE TABLE tasks_p{remainder} PARTITION OF tasks '
+                f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+            )
+
+    op.execute(f'INSERT INTO tasks ({COLUMNS}) SELECT {COLUMNS} FROM tasks_old')
+    op.drop_table('tasks_old')
+    op.execute('ALTER SEQUENCE tasks_task_id_seq OWNED BY tasks.task_id')
+    for name, columns in INDEXES:
+        op.create_index(name, 'tasks', columns)
+
+
+def upgrade() -> None:
+    _rebuild_tasks(postgresql_partition_by='HASH (organization_id)')
+
+
+def downgrade() -> None:
+    _rebuild_tasks()
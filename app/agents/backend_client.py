@@ -7,6 +7,7 @@ import httpx
 
 from app.agents.utils import build_team_capability_model
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -40,10 +41,17 @@ async def fetch_team_capability_model(
         headers = {}
 
     try:
+        team_members_data = []
         async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            team_members_data = response.json()
+            while True:
+                response = await client.get(url, params=params, headers=headers, timeout=10.0)
+                response.raise_for_status()
+                team_members_data.extend(response.json())
+                # /teams/ is keyset-paginated; follow the cursor to the last page
+                next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                if not next_cursor:
+                    break
+                params = {**params, "cursor": next_cursor}
 
         # Convert TeamMemberOut to format expected by build_team_capability_model
         # TeamMemberOut: { organization_name, member_id, name, email, designation, position }
@@ -114,9 +122,15 @@ def fetch_team_capability_model_sync(
 
     try:
         logger.info("BackendClient:fetch_team url=%s params=%s", url, params)
-        response = httpx.get(url, params=params, headers=headers, timeout=10.0)
-        response.raise_for_status()
-        team_members_data = response.json()
+        team_members_data = []
+        while True:
+            response = httpx.get(url, params=params, headers=headers, timeout=10.0)
+            response.raise_for_status()
+            team_members_data.extend(response.json())
+            next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not next_cursor:
+                break
+            params = {**params, "cursor": next_cursor}
         logger.info("BackendClient:fetch_team received %d members", len(team_members_data))
 
         team_members = []
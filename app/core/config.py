@@ -11,9 +11,93 @@ class Settings(BaseSettings):
     APP_NAME: str = "Workflowz.ai"
     API_V1_PREFIX: str = "/api"
     DATABASE_URL: str
+    # Direct (non-PgBouncer) server for the invalidation listener's LISTEN;
+    # defaults to DATABASE_URL
+    DATABASE_LISTEN_URL: str | None = None
+    # Optional streaming replica for read-only list routes; clients that wrote
+    # in the last REPLICA_STICKY_SECONDS read from the primary until the
+    # replica has replayed their write
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_STICKY_SECONDS: int = 10
+
+    # Connection pool, per worker (pool size + overflow connections at most)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Replace connections older than this (-1: never)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg's and SQLAlchemy's per-connection prepared statement caches
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Transaction-mode PgBouncer: turns both caches off and names every
+    # prepared statement uniquely, so no statement outlives its transaction
+    DB_PGBOUNCER: bool = False
+
+    # Tenant shards: extra databases by name ("default" is DATABASE_URL, which
+    # also stays the directory of users, organizations and memberships). An
+    # organization's shard is organizations.shard, unless overridden here by
+    # organization id; new organizations are placed by consistent hash over
+    # NEW_TENANT_SHARDS
+    DATABASE_SHARDS: dict[str, str] = {}
+    # Direct servers for the invalidation listener per shard (as
+    # DATABASE_LISTEN_URL); default to the DATABASE_SHARDS URLs
+    DATABASE_SHARD_LISTEN_URLS: dict[str, str] = {}
+    TENANT_SHARD_OVERRIDES: dict[int, str] = {}
+    NEW_TENANT_SHARDS: list[str] = ["default"]
+    TENANT_SHARD_REFRESH_SECONDS: int = 30
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # Keyset pagination for list endpoints (opt-in: without limit and cursor a
+    # list is returned whole); DEFAULT_PAGE_SIZE applies to a cursor alone
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+
+    # Upper bound on tasks per bulk request (POST /projects/{id}/tasks:bulk)
+    MAX_BULK_TASKS: int = 1000
+    # Upper bound on CSV rows per member import (POST /superuser/organizations/{name}/members:import)
+    MAX_IMPORT_MEMBERS: int = 1000
+
+    # Rows fetched per server-side cursor round trip when streaming /exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Structured logging (JSON lines written by a background thread)
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str | None = None
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_DEFAULT_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+    # Principal (user + organization membership) cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Per-organization cache of list responses ("memory", "redis" or "none");
+    # use "redis" when running several workers so invalidations are shared
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Cross-worker eviction of in-process caches over Postgres LISTEN/NOTIFY
+    # (one extra connection per worker)
+    INVALIDATION_BUS_ENABLED: bool = True
+    INVALIDATION_QUEUE_SIZE: int = 10000
+    INVALIDATION_HEARTBEAT_SECONDS: float = 10.0
+    INVALIDATION_RECONNECT_SECONDS: float = 1.0
+
+    # Opt-in org-scoped access tokens (organization_id/name, member_id, position claims)
+    JWT_ORG_CLAIMS_ENABLED: bool = False
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 30
+    TOKEN_REVOCATION_GRACE_SECONDS: float = 5.0
+
     OLLAMA_MODEL: str = "gpt-oss:20b"
     OLLAMA_BASE_URL: str = "http://localhost:11434"
 
@@ -0,0 +1,37 @@
+"""Weak ETags for list responses.
+
+A tag is a digest of the resource scope and the request parameters, which
+include the organization's or project's ``data_version``. Every write bumps
+that version in its own transaction, so an unchanged tag means an unchanged
+body and the request can be answered with ``304`` before any list query runs.
+"""
+import hashlib
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Response, status
+
+
+def weak_etag(scope: str, params: tuple[Hashable, ...]) -> str:
+    digest = hashlib.blake2b(f"{scope}|{params!r}".encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison against an ``If-None-Match`` header (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+async def conditional_response(
+    etag: str, if_none_match: str | None, render: Callable[[], Awaitable[Response]]
+) -> Response:
+    """``304`` when the client's copy is current, otherwise ``render()`` tagged with ``etag``."""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response = await render()
+    response.headers["ETag"] = etag
+    return response
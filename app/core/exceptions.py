@@ -11,3 +11,11 @@ def bad_request(detail: str) -> HTTPException:
 
 def forbidden(detail: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+def service_unavailable(detail: str, retry_after: int | None = None) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers=None if retry_after is None else {"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,117 @@
+"""Async password hashing on a bounded worker pool.
+
+bcrypt is deliberately slow (~250ms per call), so running it inline in an
+``async`` handler stalls every other request on the worker. ``PasswordHasher``
+moves the work to a thread or process pool and sheds load with a 503 once
+``PASSWORD_HASH_MAX_IN_FLIGHT`` operations are queued or running.
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.exceptions import service_unavailable
+from app.core.metrics import Histogram, register_metrics
+from app.core.security import get_password_hash, verify_password
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        executor_kind: str,
+        max_workers: int,
+        max_in_flight: int,
+        retry_after_seconds: int,
+    ) -> None:
+        if executor_kind not in {"thread", "process"}:
+            raise ValueError("executor_kind must be 'thread' or 'process'")
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._rejected = 0
+        self._hash_latency = Histogram()
+        self._verify_latency = Histogram()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, histogram: Histogram, func: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.max_in_flight:
+            self._rejected += 1
+            raise service_unavailable(
+                "Authentication service is busy, please retry shortly.",
+                retry_after=self.retry_after_seconds,
+            )
+        self._in_flight += 1
+        started = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            histogram.observe((perf_counter() - started) * 1000)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash_latency, get_password_hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str | Exception]:
+        """Hash a batch while holding at most ``max_workers`` in-flight slots.
+
+        The rest of the in-flight budget stays available to logins. A password
+        that cannot be hashed (``ValueError``, or the 503 when the pool is
+        saturated) comes back as its exception instead of failing the batch.
+        """
+        slots = asyncio.Semaphore(self.max_workers)
+
+        async def hash_one(password: str) -> str | Exception:
+            async with slots:
+                try:
+                    return await self.hash(password)
+                except (HTTPException, ValueError) as exc:
+                    return exc
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            self._verify_latency, verify_password, plain_password, hashed_password
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.max_workers),
+            "rejected_total": self._rejected,
+            "hash_latency": self._hash_latency.snapshot(),
+            "verify_latency": self._verify_latency.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_in_flight=settings.PASSWORD_HASH_MAX_IN_FLIGHT,
+    retry_after_seconds=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+register_metrics("password_hashing", password_hasher.metrics)
@@ -0,0 +1,286 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Each worker keeps in-process caches (principals, token revocations and, with
+the memory backend, list responses). A write evicts them locally after it
+commits and also queues ``NOTIFY workflowz_invalidate, '<org>:<entity>'`` in
+its own transaction, so the other workers hear about it exactly when the
+write becomes visible (and never for a rolled-back one). A write to a tenant
+shard notifies on that shard's database, so every worker runs one listener
+connection per database (the default one and each of ``DATABASE_SHARDS``)
+and applies their messages to its local caches.
+
+Entities:
+
+- ``projects`` / ``teams`` / ``tasks:<project_id>`` / ``organization``:
+  cached list responses (tasks also evict the project list)
+- ``principals``: cached principals of the organization's members; the
+  token revocation table refreshes on next use (role or name changes)
+- ``user:<user_id>``: one user's cached principal; their tokens issued
+  before the message was sent are revoked (new membership or role change)
+- ``shards``: the tenant shard placements (organization created on or moved
+  to another shard)
+
+Notifications are not queued while a listener is disconnected, so after a
+reconnect the worker flushes every local cache instead.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import (
+    invalidate_organization_principals,
+    invalidate_user_principal,
+    principal_cache,
+)
+from app.core.config import settings
+from app.core.logging import log_event
+from app.core.metrics import Histogram, register_metrics
+from app.core.response_cache import (
+    organization_scope,
+    projects_scope,
+    response_cache,
+    tasks_scope,
+    teams_scope,
+)
+from app.core.revocation import token_revocations
+from app.core.sharding import shard_directory
+
+CHANNEL = "workflowz_invalidate"
+
+# Tags this process's messages so its own listener skips them: the writer
+# already evicted locally after commit.
+ORIGIN = uuid.uuid4().hex[:12]
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+# Engines the current request published invalidations on (see track_writes).
+_published_on: ContextVar[set[Any] | None] = ContextVar("published_on", default=None)
+
+
+@contextmanager
+def track_writes() -> Iterator[set[Any]]:
+    """Collect the engines ``publish_invalidation`` is called on inside the block.
+
+    Every write to cached data publishes, so this tells a middleware whether
+    (and where) a request changed anything.
+    """
+    published_on: set[Any] = set()
+    token = _published_on.set(published_on)
+    try:
+        yield published_on
+    finally:
+        _published_on.reset(token)
+
+
+async def publish_invalidation(
+    db: AsyncSession, organization_id: int, *entities: str
+) -> None:
+    """Queue one notification per entity in the caller's transaction."""
+    published_on = _published_on.get()
+    if published_on is not None:
+        published_on.add(db.bind)
+    suffix = f"@{ORIGIN}:{time.time():.3f}"
+    await db.execute(
+        _NOTIFY,
+        [
+            {"channel": CHANNEL, "payload": f"{organization_id}:{entity}{suffix}"}
+            for entity in entities
+        ],
+    )
+
+
+def _response_scopes(organization_id: int, kind: str, argument: str) -> list[str] | None:
+    if kind == "projects":
+        return [projects_scope(organization_id)]
+    if kind == "tasks":
+        return [tasks_scope(organization_id, int(argument)), projects_scope(organization_id)]
+    if kind == "teams":
+        return [teams_scope(organization_id)]
+    if kind == "organization":
+        return [organization_scope(organization_id)]
+    return None
+
+
+async def apply_invalidation(
+    organization_id: int, entity: str, sent_at: float | None = None
+) -> None:
+    """Evict this worker's cache entries for one entity of the organization.
+
+    ``sent_at`` is when the writer published the message (after setting any
+    ``tokens_valid_after``); it defaults to now.
+    """
+    kind, _, argument = entity.partition(":")
+    if kind == "principals":
+        invalidate_organization_principals(organization_id)
+        token_revocations.expire()
+    elif kind == "user":
+        user_id = int(argument)
+        invalidate_user_principal(user_id)
+        token_revocations.revoke({user_id: sent_at if sent_at is not None else time.time()})
+    elif kind == "shards":
+        shard_directory.expire()
+    else:
+        scopes = _response_scopes(organization_id, kind, argument)
+        if scopes is None:
+            raise ValueError(f"unknown entity {entity!r}")
+        await response_cache.invalidate_local(*scopes)
+
+
+def flush_local_caches() -> None:
+    principal_cache.clear()
+    response_cache.clear_local()
+    token_revocations.expire()
+    shard_directory.expire()
+
+
+class InvalidationListener:
+    """Background tasks applying other workers' notifications to local caches."""
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float, reconnect_seconds: float) -> None:
+        self.heartbeat_seconds = heartbeat_seconds
+        self.reconnect_seconds = reconnect_seconds
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._overflowed = False
+        self.connected: set[str] = set()
+        self.received = 0
+        self.applied = 0
+        self.own = 0
+        self.dropped = 0
+        self.malformed = 0
+        self.reconnects = 0
+        self.flushes = 0
+        self.lag_ms = Histogram()
+
+    def start(self, connects: dict[str, Callable[[], Awaitable[Any]]]) -> None:
+        """Listen until ``stop``; each callable opens a dedicated asyncpg connection.
+
+        ``connects`` maps a database name (for logs and stats) to its opener.
+        """
+        if not self._tasks:
+            self._tasks = {
+                database: asyncio.create_task(self._run(database, connect))
+                for database, connect in connects.items()
+            }
+
+    async def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = {}
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.received += 1
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Losing a message means some cache may stay stale: flush instead.
+            self.dropped += 1
+            self._overflowed = True
+
+    async def _run(self, database: str, connect: Callable[[], Awaitable[Any]]) -> None:
+        attempts = 0
+        while True:
+            connection = None
+            try:
+                connection = await connect()
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notification)
+                self.connected.add(database)
+                if attempts:
+                    # Anything published while we were away was not delivered.
+                    self.reconnects += 1
+                    self._flush("reconnect")
+                attempts += 1
+                await self._consume(connection, lost)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                attempts += 1
+                log_event(
+                    "invalidation.disconnected",
+                    level=logging.WARNING,
+                    database=database,
+                    error=type(exc).__name__,
+                )
+            finally:
+                self.connected.discard(database)
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(self.reconnect_seconds)
+
+    async def _consume(self, connection, lost: asyncio.Event) -> None:
+        while not lost.is_set():
+            if self._overflowed:
+                self._overflowed = False
+                self._drain()
+                self._flush("overflow")
+            try:
+                payload = await asyncio.wait_for(self._queue.get(), self.heartbeat_seconds)
+            except asyncio.TimeoutError:
+                # A silent channel and a dead socket look the same; ask.
+                await connection.fetchval("SELECT 1")
+                continue
+            await self._apply(payload)
+
+    async def _apply(self, payload: str) -> None:
+        try:
+            body, _, meta = payload.rpartition("@")
+            origin, _, sent_at = meta.partition(":")
+            if origin == ORIGIN:
+                self.own += 1
+                return
+            organization_id, _, entity = body.partition(":")
+            sent = float(sent_at)
+            await apply_invalidation(int(organization_id), entity, sent)
+        except ValueError:
+            self.malformed += 1
+            log_event("invalidation.malformed", level=logging.WARNING, payload=payload[:200])
+            return
+        self.applied += 1
+        self.lag_ms.observe(max(0.0, (time.time() - sent) * 1000))
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def _flush(self, reason: str) -> None:
+        self.flushes += 1
+        flush_local_caches()
+        log_event("invalidation.flushed", reason=reason)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": bool(self._tasks),
+            "connected": bool(self._tasks) and self.connected == set(self._tasks),
+            "connected_databases": sorted(self.connected),
+            "queue_size": self._queue.qsize(),
+            "received": self.received,
+            "applied": self.applied,
+            "own": self.own,
+            "dropped": self.dropped,
+            "malformed": self.malformed,
+            "reconnects": self.reconnects,
+            "flushes": self.flushes,
+            "lag_ms": self.lag_ms.snapshot(),
+        }
+
+
+invalidation_listener = InvalidationListener(
+    queue_size=settings.INVALIDATION_QUEUE_SIZE,
+    heartbeat_seconds=settings.INVALIDATION_HEARTBEAT_SECONDS,
+    reconnect_seconds=settings.INVALIDATION_RECONNECT_SECONDS,
+)
+register_metrics("invalidation", invalidation_listener.stats)
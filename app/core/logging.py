@@ -0,0 +1,124 @@
+"""Non-blocking, sampled structured logging.
+
+Request handlers only enqueue records; a ``QueueListener`` thread formats them
+as JSON lines and writes them to ``LOG_FILE`` (or stderr), so a slow log disk
+never shows up in request latency. When the queue is full records are dropped
+and counted rather than blocking the caller.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+LOGGER_NAME = "workflowz"
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", record.getMessage()),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a configurable fraction of records per event name."""
+
+    def __init__(self, rates: dict[str, float], default_rate: float) -> None:
+        super().__init__()
+        self.rates = rates
+        self.default_rate = default_rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(getattr(record, "event", ""), self.default_rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the traceback here: exc_info does not survive the queue.
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared = super().prepare(record)
+        prepared.exc_text = exc_text
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> None:
+    """Attach the queue handler and start the background writer (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    if settings.LOG_FILE:
+        target: logging.Handler = logging.FileHandler(settings.LOG_FILE, encoding="utf-8")
+    else:
+        target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(JsonFormatter())
+
+    queue_handler = DroppingQueueHandler(log_queue)
+    sampler = SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_DEFAULT_SAMPLE_RATE)
+    queue_handler.addFilter(sampler)
+
+    logger.handlers = [queue_handler]
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, target, respect_handler_level=True)
+    _listener.start()
+
+    register_metrics(
+        "logging",
+        lambda: {
+            "queue_size": log_queue.qsize(),
+            "dropped_total": queue_handler.dropped,
+            "sampled_out_total": sampler.sampled_out,
+        },
+    )
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Emit a structured event; ``fields`` become top-level JSON keys."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"event": event, "fields": fields})
@@ -0,0 +1,49 @@
+"""In-process metrics registry exposed on ``/metrics``."""
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Callable
+
+DEFAULT_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of millisecond observations."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    def observe(self, value_ms: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value_ms)] += 1
+            self._sum += value_ms
+            self._count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            cumulative = 0
+            buckets: dict[str, int] = {}
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[f"le_{bound:g}"] = cumulative
+            buckets["le_inf"] = self._count
+            return {
+                "count": self._count,
+                "sum_ms": round(self._sum, 3),
+                "buckets": buckets,
+            }
+
+
+_sources: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, source: Callable[[], dict[str, Any]]) -> None:
+    """Register a callable whose snapshot appears under ``name`` on /metrics."""
+    _sources[name] = source
+
+
+def collect_metrics() -> dict[str, Any]:
+    return {name: source() for name, source in _sources.items()}
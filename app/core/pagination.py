@@ -0,0 +1,104 @@
+"""Opaque keyset-pagination cursors.
+
+List endpoints keep returning a plain JSON array; when more rows exist the
+cursor for the next page is sent in the ``X-Next-Cursor`` response header and
+passed back as the ``cursor`` query parameter. Pagination is opt-in: a
+request with neither ``limit`` nor ``cursor`` gets the whole list, as before
+pagination existed.
+"""
+import base64
+import json
+from datetime import date
+from typing import Any, Callable, Generic, NamedTuple, Sequence, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row, Select
+
+from app.core.config import settings
+from app.core.exceptions import bad_request
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class Page(NamedTuple, Generic[T]):
+    items: list[T]
+    next_key: list[Any] | None
+
+
+def page_size(limit: int | None, cursor: str | None) -> int | None:
+    """Rows per page, or None to return the whole list (no ``limit`` nor ``cursor``)."""
+    if limit is None and cursor is None:
+        return None
+    return limit if limit is not None else settings.DEFAULT_PAGE_SIZE
+
+
+def limit_page(stmt: Select, limit: int | None) -> Select:
+    """Fetch one row past the page, so ``paginate`` can tell whether more follow."""
+    return stmt if limit is None else stmt.limit(limit + 1)
+
+
+def paginate(
+    rows: Sequence[T], limit: int | None, key: Callable[[T], list[Any]]
+) -> Page[T]:
+    """Build a page from a ``limit_page`` query."""
+    if limit is None or len(rows) <= limit:
+        return Page(list(rows), None)
+    items = list(rows[:limit])
+    return Page(items, key(items[-1]))
+
+
+def encode_cursor(key: list[Any]) -> str:
+    raw = json.dumps(key, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def load_cursor(cursor: str) -> Any:
+    """Undo ``encode_cursor`` without checking the shape of the result."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as exc:
+        raise bad_request("Invalid cursor.") from exc
+
+
+def decode_cursor(cursor: str | None, types: tuple[type, ...]) -> list[Any] | None:
+    """Return the decoded sort key typed as ``types``, or None for the first page."""
+    if cursor is None:
+        return None
+    raw = load_cursor(cursor)
+    try:
+        if not isinstance(raw, list) or len(raw) != len(types):
+            raise ValueError("cursor shape mismatch")
+        key = []
+        for value, expected in zip(raw, types):
+            if expected is date:
+                value = date.fromisoformat(value)
+            elif type(value) is not expected:
+                raise ValueError("cursor type mismatch")
+            key.append(value)
+    except (TypeError, ValueError) as exc:
+        raise bad_request("Invalid cursor.") from exc
+    return key
+
+
+def set_next_cursor(response: Response, next_key: list[Any] | None) -> None:
+    if next_key is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_key)
+
+
+def page_response(adapter: TypeAdapter, page: Page[Row]) -> Response:
+    """Serialize a page of column-projected rows straight to a JSON response.
+
+    The rows come from our own database and already have the output shape, so
+    ``adapter`` (a ``TypeAdapter`` over a TypedDict list) only dumps them; no
+    ORM objects are built and no per-row model validation runs.
+    """
+    response = Response(
+        adapter.dump_json([row._asdict() for row in page.items]),
+        media_type="application/json",
+    )
+    set_next_cursor(response, page.next_key)
+    return response
@@ -0,0 +1,269 @@
+"""Per-organization cache of serialized list responses.
+
+Entries are keyed by scope (``projects:{org}``, ``tasks:{org}:{project}``,
+``teams:{org}``), the current generation of that scope and of its
+organization, and the request parameters (filters, cursor, role and member).
+Writes never delete entries: they bump a generation, which makes every older
+key unreachable, and the backend's LRU/TTL reclaims them. Because the
+generations are read before the database is, a page rendered concurrently
+with a write is stored under the old generation and never served afterwards.
+
+Two backends are provided: an in-process LRU and a Redis-protocol one (any
+server speaking RESP, such as a local stand-in) for deployments with several
+workers. Concurrent misses for the same key in one process are coalesced so
+only one of them queries Postgres.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Protocol
+
+from fastapi import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.logging import log_event
+from app.core.metrics import register_metrics
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+
+class CacheBackend(Protocol):
+    # Whether every worker sees the same entries and generations.
+    shared: bool
+
+    async def generations(self, scopes: list[str]) -> list[int]: ...
+
+    async def bump(self, scopes: list[str]) -> None: ...
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class MemoryBackend:
+    """``TTLCache`` entries plus a generation counter per scope, in this process only."""
+
+    shared = False
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+
+    async def generations(self, scopes: list[str]) -> list[int]:
+        return [self._generations.get(scope, 0) for scope in scopes]
+
+    async def bump(self, scopes: list[str]) -> None:
+        for scope in scopes:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries.set(key, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", **self._entries.stats(), "scopes": len(self._generations)}
+
+
+class RedisBackend:
+    """Entries and generations in Redis, shared by every worker.
+
+    Requires the optional ``redis`` package; entries expire after ``ttl``
+    seconds, generation counters are kept (one small key per scope).
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int, prefix: str = "workflowz:") -> None:
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def generations(self, scopes: list[str]) -> list[int]:
+        values = await self.client.mget([f"{self.prefix}gen:{scope}" for scope in scopes])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, scopes: list[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(f"{self.prefix}gen:{scope}")
+            await pipe.execute()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(f"{self.prefix}resp:{key}")
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.client.set(f"{self.prefix}resp:{key}", value, ex=self.ttl)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "redis", "ttl_seconds": self.ttl}
+
+
+def _encode(response: Response) -> bytes:
+    cursor = response.headers.get(NEXT_CURSOR_HEADER, "")
+    return cursor.encode() + b"\n" + response.body
+
+
+def _decode(value: bytes) -> Response:
+    cursor, _, body = value.partition(b"\n")
+    response = Response(body, media_type="application/json")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor.decode()
+    return response
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend | None) -> None:
+        self.backend = backend
+        self._in_flight: dict[str, asyncio.Future[bytes | None]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get_or_render(
+        self,
+        organization_id: int,
+        scope: str,
+        params: tuple[Hashable, ...],
+        render: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Serve a cached copy of ``render()`` for this scope and ``params``."""
+        if self.backend is None:
+            return await render()
+        try:
+            org_generation, scope_generation = await self.backend.generations(
+                [organization_scope(organization_id), scope]
+            )
+            key = f"{scope}:{org_generation}.{scope_generation}:{params!r}"
+            value = await self.backend.get(key)
+        except Exception as exc:
+            self._backend_error("get", exc)
+            return await render()
+        if value is not None:
+            self.hits += 1
+            return _decode(value)
+
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            self.coalesced += 1
+            value = await asyncio.shield(leader)
+            # None: the leading request failed, so render independently.
+            return _decode(value) if value is not None else await render()
+
+        self.misses += 1
+        future: asyncio.Future[bytes | None] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await render()
+        except BaseException:
+            future.set_result(None)
+            raise
+        finally:
+            del self._in_flight[key]
+        value = _encode(response)
+        future.set_result(value)
+        try:
+            await self.backend.set(key, value)
+        except Exception as exc:
+            self._backend_error("set", exc)
+        return response
+
+    async def invalidate(self, *scopes: str) -> None:
+        if self.backend is None:
+            return
+        try:
+            await self.backend.bump(list(scopes))
+        except Exception as exc:
+            self._backend_error("invalidate", exc)
+
+    async def invalidate_local(self, *scopes: str) -> None:
+        """``invalidate`` for another worker's write; shared backends already saw it."""
+        if self.backend is not None and not self.backend.shared:
+            await self.invalidate(*scopes)
+
+    def clear_local(self) -> None:
+        if isinstance(self.backend, MemoryBackend):
+            self.backend.clear()
+
+    def _backend_error(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        log_event(
+            "response_cache.error",
+            level=logging.WARNING,
+            operation=operation,
+            error=type(exc).__name__,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        if self.backend is None:
+            return {"backend": "none"}
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+def organization_scope(organization_id: int) -> str:
+    return f"org:{organization_id}"
+
+
+def projects_scope(organization_id: int) -> str:
+    return f"projects:{organization_id}"
+
+
+def tasks_scope(organization_id: int, project_id: int) -> str:
+    return f"tasks:{organization_id}:{project_id}"
+
+
+def teams_scope(organization_id: int) -> str:
+    return f"teams:{organization_id}"
+
+
+def _build_backend() -> CacheBackend | None:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(
+            maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(
+            settings.RESPONSE_CACHE_REDIS_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return None
+    raise ValueError("RESPONSE_CACHE_BACKEND must be 'memory', 'redis' or 'none'")
+
+
+response_cache = ResponseCache(_build_backend())
+register_metrics("response_cache", response_cache.stats)
+
+
+async def invalidate_projects(organization_id: int) -> None:
+    await response_cache.invalidate(projects_scope(organization_id))
+
+
+async def invalidate_tasks(organization_id: int, project_id: int) -> None:
+    """Task writes also change the project's progress in the project list."""
+    await response_cache.invalidate(
+        tasks_scope(organization_id, project_id), projects_scope(organization_id)
+    )
+
+
+async def invalidate_teams(organization_id: int) -> None:
+    await response_cache.invalidate(teams_scope(organization_id))
+
+
+async def invalidate_organization(organization_id: int) -> None:
+    """Every cached list of the organization (e.g. after a rename)."""
+    await response_cache.invalidate(organization_scope(organization_id))
@@ -0,0 +1,99 @@
+"""In-memory table of recent token revocations for org-scoped access tokens.
+
+Org-scoped tokens are trusted for DB-free authorization unless they were
+issued (``iat``) before their user's ``users.tokens_valid_after``. Role
+changes, renames and membership joins set that column, so requests with
+older tokens fall back to a database lookup.
+
+Each worker only tracks revocations newer than the token lifetime (older
+ones cannot match a live token). It applies revocations as they happen,
+its own after commit and other workers' from the invalidation bus, and
+every ``TOKEN_REVOCATION_REFRESH_SECONDS`` reads just the rows revoked since
+its previous refresh.
+
+``tokens_valid_after`` is set a little before its transaction commits, and a
+login racing that commit may still read the old membership. Tokens issued
+within ``TOKEN_REVOCATION_GRACE_SECONDS`` after a revocation are therefore
+not trusted either; the same margin is re-read on every refresh.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+
+class TokenRevocationTable:
+    def __init__(self, refresh_seconds: float, grace_seconds: float, lifetime_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.grace_seconds = grace_seconds
+        self.lifetime_seconds = lifetime_seconds
+        self._valid_after: dict[int, float] = {}
+        self._refreshed_at: float | None = None
+        self._due = True
+        self.accepted = 0
+        self.revoked = 0
+        self.refreshes = 0
+
+    def is_stale(self) -> bool:
+        return (
+            self._due
+            or self._refreshed_at is None
+            or time.time() - self._refreshed_at >= self.refresh_seconds
+        )
+
+    def refresh_since(self) -> datetime:
+        """Revocations after this instant are read by the next refresh."""
+        since = time.time() - self.lifetime_seconds
+        if self._refreshed_at is not None:
+            since = max(since, self._refreshed_at - self.grace_seconds)
+        return datetime.fromtimestamp(since, timezone.utc)
+
+    def merge(self, valid_after: dict[int, float], refreshed_at: float) -> None:
+        """Apply a refresh that started at ``refreshed_at`` (see ``refresh_since``)."""
+        self.revoke(valid_after)
+        horizon = refreshed_at - self.lifetime_seconds - self.grace_seconds
+        self._valid_after = {
+            user_id: revoked_at
+            for user_id, revoked_at in self._valid_after.items()
+            if revoked_at > horizon
+        }
+        self._refreshed_at = refreshed_at
+        self._due = False
+        self.refreshes += 1
+
+    def revoke(self, valid_after: dict[int, float]) -> None:
+        """Record revocations (user id to ``tokens_valid_after`` as a timestamp)."""
+        for user_id, revoked_at in valid_after.items():
+            if revoked_at > self._valid_after.get(user_id, 0.0):
+                self._valid_after[user_id] = revoked_at
+
+    def expire(self) -> None:
+        """Refresh on next use (e.g. another worker revoked a whole organization)."""
+        self._due = True
+
+    def is_trusted(self, user_id: int, issued_at: float) -> bool:
+        revoked_at = self._valid_after.get(user_id)
+        trusted = revoked_at is None or issued_at > revoked_at + self.grace_seconds
+        if trusted:
+            self.accepted += 1
+        else:
+            self.revoked += 1
+        return trusted
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "tracked_users": len(self._valid_after),
+            "refreshes": self.refreshes,
+            "accepted": self.accepted,
+            "revoked": self.revoked,
+        }
+
+
+token_revocations = TokenRevocationTable(
+    refresh_seconds=settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+    grace_seconds=settings.TOKEN_REVOCATION_GRACE_SECONDS,
+    lifetime_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+register_metrics("token_revocations", token_revocations.stats)
@@ -0,0 +1,85 @@
+"""Which database shard holds each organization's projects and tasks.
+
+``DATABASE_URL`` is the ``default`` shard and the directory: users,
+organizations and memberships are always read and written there. An
+organization placed on another shard (``organizations.shard`` or
+``TENANT_SHARD_OVERRIDES``) keeps its projects, tasks and tombstones on that
+database, next to a mirror of its organization row and members (see
+app.database.shards). Each worker keeps a copy of the non-default placements
+and reloads it every ``TENANT_SHARD_REFRESH_SECONDS``, or sooner when another
+worker publishes a ``shards`` invalidation.
+"""
+import hashlib
+from time import monotonic
+from typing import Any, Iterable
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+DEFAULT_SHARD = "default"
+
+
+def place_new_organization(name: str, shards: list[str] | None = None) -> str:
+    """Shard for a new organization, by rendezvous hashing of its name.
+
+    Adding a shard to ``NEW_TENANT_SHARDS`` only takes the names that now
+    hash to it; the choice is stored on the organization, so existing
+    organizations never move on their own.
+    """
+    candidates = shards if shards is not None else settings.NEW_TENANT_SHARDS
+
+    def weight(shard: str) -> bytes:
+        return hashlib.blake2b(f"{shard}:{name}".encode(), digest_size=8).digest()
+
+    return max(candidates, key=weight) if candidates else DEFAULT_SHARD
+
+
+class ShardDirectory:
+    def __init__(self, refresh_seconds: float, overrides: dict[int, str]) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.overrides = dict(overrides)
+        self._by_id: dict[int, str] = {}
+        self._ids_by_name: dict[str, int] = {}
+        self._loaded_at: float | None = None
+        self.lookups: dict[str, int] = {}
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def replace(self, placements: Iterable[tuple[int, str, str | None]]) -> None:
+        """Load ``(organization id, name, shard column)`` rows."""
+        by_id: dict[int, str] = {}
+        ids_by_name: dict[str, int] = {}
+        for organization_id, name, shard in placements:
+            by_id[organization_id] = self.overrides.get(organization_id, shard or DEFAULT_SHARD)
+            ids_by_name[name] = organization_id
+        self._by_id, self._ids_by_name = by_id, ids_by_name
+        self._loaded_at = monotonic()
+
+    def expire(self) -> None:
+        """Reload on next use (e.g. another worker moved an organization)."""
+        self._loaded_at = None
+
+    def shard_of(self, organization_id: int) -> str:
+        shard = self._by_id.get(organization_id, DEFAULT_SHARD)
+        self.lookups[shard] = self.lookups.get(shard, 0) + 1
+        return shard
+
+    def shard_of_name(self, name: str) -> str:
+        organization_id = self._ids_by_name.get(name)
+        if organization_id is None:
+            self.lookups[DEFAULT_SHARD] = self.lookups.get(DEFAULT_SHARD, 0) + 1
+            return DEFAULT_SHARD
+        return self.shard_of(organization_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "placed_organizations": len(self._by_id),
+            "lookups": dict(self.lookups),
+        }
+
+
+shard_directory = ShardDirectory(
+    settings.TENANT_SHARD_REFRESH_SECONDS, settings.TENANT_SHARD_OVERRIDES
+)
+register_metrics("tenant_shards", shard_directory.stats)
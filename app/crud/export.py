@@ -0,0 +1,42 @@
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.project import PROJECT_OUT_COLUMNS
+from app.crud.task import TASK_OUT_COLUMNS
+from app.crud.team import TEAM_MEMBER_OUT_COLUMNS
+from app.database.models import Organization, Project, Task, TeamMember
+
+
+def export_statement(organization_id: int, resource: str) -> Select:
+    """All of one organization's ``resource`` rows, shaped like the list endpoints."""
+    if resource == "projects":
+        model, columns, order_by = Project, PROJECT_OUT_COLUMNS, (Project.project_id,)
+    elif resource == "tasks":
+        model, columns, order_by = Task, TASK_OUT_COLUMNS, (Task.project_id, Task.task_id)
+    elif resource == "teams":
+        model, columns, order_by = TeamMember, TEAM_MEMBER_OUT_COLUMNS, (TeamMember.member_id,)
+    else:
+        raise ValueError(f"Unknown export resource: {resource}")
+    return (
+        select(*columns)
+        .select_from(model)
+        .join(Organization, Organization.id == model.organization_id)
+        .where(model.organization_id == organization_id)
+        .order_by(*order_by)
+    )
+
+
+async def stream_export_rows(
+    db: AsyncSession, organization_id: int, resource: str, *, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield ``batch_size`` rows at a time from a server-side cursor.
+
+    Only one batch is held in memory, whatever the tenant's size.
+    """
+    result = await db.stream(
+        export_statement(organization_id, resource).execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions():
+        yield partition
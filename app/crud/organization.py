@@ -0,0 +1,169 @@
+from typing import Iterable
+
+from sqlalchemy import Row, and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.exceptions import service_unavailable
+from app.core.pagination import Page, limit_page, paginate
+from app.database.models import Organization, TeamMember
+
+
+def set_organization_name(instance, organization_name: str):
+    """Populate ``organization_name`` on a row returned by INSERT ... RETURNING.
+
+    The column_property subquery cannot be correlated inside an INSERT, so
+    create paths pass the name they already know instead of re-selecting.
+    """
+    set_committed_value(instance, "organization_name", organization_name)
+    return instance
+
+
+async def get_organization_by_name(db: AsyncSession, name: str) -> Organization | None:
+    result = await db.execute(select(Organization).where(Organization.name == name))
+    return result.scalar_one_or_none()
+
+
+async def get_organization_id(db: AsyncSession, name: str) -> int | None:
+    result = await db.execute(select(Organization.id).where(Organization.name == name))
+    return result.scalar_one_or_none()
+
+
+async def create_organization(
+    db: AsyncSession, name: str, shard: str | None = None
+) -> Organization:
+    """Insert the organization row; caller commits together with its head."""
+    result = await db.execute(
+        insert(Organization).values(name=name, shard=shard).returning(Organization)
+    )
+    return result.scalar_one()
+
+
+async def get_shard_placements(
+    db: AsyncSession, organization_ids: Iterable[int] = ()
+) -> list[Row]:
+    """Id, name and shard of organizations off the default shard, plus ``organization_ids``."""
+    result = await db.execute(
+        select(Organization.id, Organization.name, Organization.shard).where(
+            or_(Organization.shard.is_not(None), Organization.id.in_(list(organization_ids)))
+        )
+    )
+    return result.all()
+
+
+async def rename_organization(db: AsyncSession, organization_id: int, new_name: str) -> None:
+    """Single-row rename; tenant rows reference the id. Caller commits.
+
+    Every list shows the organization name and is tagged with the
+    organization's ``data_version``, so the rename bumps it.
+    """
+    await db.execute(
+        update(Organization)
+        .where(Organization.id == organization_id)
+        .values(name=new_name, data_version=Organization.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_data_version(db: AsyncSession, organization_id: int) -> int | None:
+    result = await db.execute(
+        select(Organization.data_version).where(Organization.id == organization_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def bump_data_version(db: AsyncSession, organization_id: int) -> int:
+    """Advance the organization's data version and return it; caller commits.
+
+    Writes call this before touching any tenant row and stamp the rows they
+    write with the returned version (``change_version``). The row lock it
+    takes is held until commit, so an organization's versions commit in
+    order and a reader that sees version N also sees every write up to N.
+    """
+    result = await db.execute(
+        update(Organization)
+        .where(Organization.id == organization_id)
+        .values(data_version=Organization.data_version + 1)
+        .returning(Organization.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
+async def bump_tenant_data_version(db: AsyncSession, organization_id: int) -> int:
+    """``bump_data_version`` for writes to projects, tasks and tombstones.
+
+    Only succeeds where the organization's tenant rows live: a shard that
+    holds them has the organization row with ``shard`` unset. A tenant move
+    (app.database.shards) sets ``shard`` on the directory, or deletes the row
+    on another shard, before it releases this row's lock. A write queued
+    behind the move, or routed by a worker that has not heard of it yet, gets
+    a 503 to retry instead of landing in the copy being dropped.
+    """
+    result = await db.execute(
+        update(Organization)
+        .where(Organization.id == organization_id, Organization.shard.is_(None))
+        .values(data_version=Organization.data_version + 1)
+        .returning(Organization.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        raise service_unavailable(
+            "Organization data is being moved to another shard, please retry shortly.",
+            retry_after=1,
+        )
+    return version
+
+
+ORGANIZATION_SORT_KEYS: dict[str, tuple[type, ...]] = {
+    "name": (str,),
+    "member_count": (int, str),
+}
+
+
+async def get_organization_summaries_page(
+    db: AsyncSession,
+    *,
+    limit: int | None,
+    after: list | None = None,
+    sort: str = "name",
+) -> Page[Row]:
+    """Organization name, head and member count for one page, in a single GROUP BY."""
+    is_head = TeamMember.position == "head"
+    member_count = func.count(TeamMember.member_id).label("member_count")
+    stmt = (
+        select(
+            Organization.name.label("organization_name"),
+            func.max(TeamMember.name).filter(is_head).label("head_name"),
+            func.max(TeamMember.email).filter(is_head).label("head_email"),
+            member_count,
+        )
+        .outerjoin(TeamMember, TeamMember.organization_id == Organization.id)
+        .group_by(Organization.id)
+    )
+
+    if sort == "member_count":
+        count = func.count(TeamMember.member_id)
+        if after is not None:
+            stmt = stmt.having(
+                or_(
+                    count < after[0],
+                    and_(count == after[0], Organization.name > after[1]),
+                )
+            )
+        stmt = stmt.order_by(member_count.desc(), Organization.name)
+
+        def key(row: Row) -> list:
+            return [row.member_count, row.organization_name]
+
+    else:
+        if after is not None:
+            stmt = stmt.where(Organization.name > after[0])
+        stmt = stmt.order_by(Organization.name)
+
+        def key(row: Row) -> list:
+            return [row.organization_name]
+
+    result = await db.execute(limit_page(stmt, limit))
+    return paginate(result.all(), limit, key)
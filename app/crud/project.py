@@ -1,22 +1,46 @@
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Row, and_, case, delete, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import Project, Task
+from app.core.invalidation import publish_invalidation
+from app.core.pagination import Page, limit_page, paginate
+from app.core.response_cache import invalidate_projects, invalidate_tasks
+from app.crud.organization import bump_tenant_data_version, set_organization_name
+from app.crud.sync import record_deletion
+from app.database.models import Organization, Project, Task
 
 
-async def get_projects(db: AsyncSession, organization_name: str) -> list[Project]:
-    result = await db.execute(
-        select(Project).where(Project.organization_name == organization_name)
+# Exactly the ``ProjectOut`` fields, selected as plain rows for list reads.
+PROJECT_OUT_COLUMNS = (
+    Organization.name.label("organization_name"),
+    Project.project_id,
+    Project.project_name,
+    Project.project_description,
+    Project.project_progress,
+    Project.created_by,
+)
+
+
+async def get_projects_page(
+    db: AsyncSession, organization_id: int, *, limit: int | None, after: list | None = None
+) -> Page[Row]:
+    stmt = (
+        select(*PROJECT_OUT_COLUMNS)
+        .select_from(Project)
+        .join(Organization, Organization.id == Project.organization_id)
+        .where(Project.organization_id == organization_id)
     )
-    return list(result.scalars().all())
+    if after is not None:
+        stmt = stmt.where(Project.project_id > after[0])
+    result = await db.execute(limit_page(stmt.order_by(Project.project_id), limit))
+    return paginate(result.all(), limit, lambda project: [project.project_id])
 
 
 async def get_project(
-    db: AsyncSession, organization_name: str, project_id: int
+    db: AsyncSession, organization_id: int, project_id: int
 ) -> Project | None:
     result = await db.execute(
         select(Project).where(
-            Project.organization_name == organization_name,
+            Project.organization_id == organization_id,
             Project.project_id == project_id,
         )
     )
@@ -25,64 +49,228 @@ async def get_project(
 
 async def create_project(
     db: AsyncSession,
+    organization_id: int,
     organization_name: str,
     project_name: str,
     project_description: str | None,
     created_by: str,
 ) -> Project:
-    project = Project(
-        organization_name=organization_name,
-        project_name=project_name,
-        project_description=project_description,
-        created_by=created_by,
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        insert(Project)
+        .values(
+            organization_id=organization_id,
+            project_name=project_name,
+            project_description=project_description,
+            created_by=created_by,
+            change_version=version,
+        )
+        .returning(Project)
     )
-    db.add(project)
+    project = set_organization_name(result.scalar_one(), organization_name)
+    await publish_invalidation(db, organization_id, "projects")
     await db.commit()
-    await db.refresh(project)
+    await invalidate_projects(organization_id)
     return project
 
 
 async def update_project(
-    db: AsyncSession, project: Project, data: dict
-) -> Project:
-    for key, value in data.items():
-        setattr(project, key, value)
+    db: AsyncSession, organization_id: int, project_id: int, data: dict
+) -> Project | None:
+    if not data:
+        return await get_project(db, organization_id, project_id)
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        update(Project)
+        .where(
+            Project.organization_id == organization_id,
+            Project.project_id == project_id,
+        )
+        .values(**data, change_version=version)
+        .returning(Project, Project.organization_name)
+        .execution_options(synchronize_session=False)
+    )
+    project = result.scalar_one_or_none()
+    if project is None:
+        await db.rollback()
+        return None
+    await publish_invalidation(db, organization_id, "projects")
     await db.commit()
-    await db.refresh(project)
+    await invalidate_projects(organization_id)
     return project
 
 
-async def delete_project(db: AsyncSession, project: Project) -> None:
-    await db.delete(project)
+async def delete_project(
+    db: AsyncSession, organization_id: int, project_id: int
+) -> bool:
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        delete(Project)
+        .where(
+            Project.organization_id == organization_id,
+            Project.project_id == project_id,
+        )
+        .returning(Project.project_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
+    await record_deletion(db, organization_id, version, "project", project_id)
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
     await db.commit()
+    await invalidate_tasks(organization_id, project_id)
+    return True
 
 
-async def recalculate_project_progress(
-    db: AsyncSession, organization_name: str, project_id: int
-) -> int:
-    result = await db.execute(
-        select(Task).where(
-            Task.organization_name == organization_name,
-            Task.project_id == project_id,
+IMPORTANCE_WEIGHTS = {"high": 3, "medium": 2, "low": 1}
+
+
+def task_weight(task_importance: str | None) -> int:
+    return IMPORTANCE_WEIGHTS.get(task_importance, 1)
+
+
+def task_weight_expr(importance_column: ColumnElement) -> ColumnElement[int]:
+    """SQL equivalent of ``task_weight`` for set-based statements."""
+    return case(
+        *((importance_column == name, weight) for name, weight in IMPORTANCE_WEIGHTS.items()),
+        else_=1,
+    )
+
+
+def _progress_expr(total: ColumnElement, completed: ColumnElement) -> ColumnElement[int]:
+    return case((total > 0, (completed * 100) // total), else_=0)
+
+
+async def apply_progress_delta(
+    db: AsyncSession,
+    organization_id: int,
+    project_id: int,
+    total_delta: int,
+    completed_delta: int,
+    *,
+    change_version: int,
+) -> None:
+    """Adjust the project's weight counters and progress in one UPDATE; caller commits.
+
+    Every task write goes through here, so it also stamps the project with
+    the write's ``change_version`` (from ``bump_tenant_data_version``), even
+    when the weights do not change.
+    """
+    values = {"change_version": change_version}
+    if total_delta or completed_delta:
+        total = Project.total_weight + total_delta
+        completed = Project.completed_weight + completed_delta
+        values.update(
+            total_weight=total,
+            completed_weight=completed,
+            project_progress=_progress_expr(total, completed),
+        )
+    await db.execute(
+        update(Project)
+        .where(
+            Project.organization_id == organization_id,
+            Project.project_id == project_id,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _weights_by_project():
+    weight = task_weight_expr(Task.task_importance)
+    return (
+        select(
+            Task.organization_id,
+            Task.project_id,
+            func.sum(weight).label("total_weight"),
+            func.coalesce(
+                func.sum(weight).filter(Task.task_completed.is_(True)), 0
+            ).label("completed_weight"),
         )
+        .group_by(Task.organization_id, Task.project_id)
     )
-    tasks = list(result.scalars().all())
-    if not tasks:
-        progress = 0
-    else:
-        weight_map = {"high": 3, "medium": 2, "low": 1, None: 1}
-        total_weight = 0
-        completed_weight = 0
-        for task in tasks:
-            weight = weight_map.get(task.task_importance, 1)
-            total_weight += weight
-            if task.task_completed:
-                completed_weight += weight
-        progress = int((completed_weight / total_weight) * 100) if total_weight else 0
-
-    project = await get_project(db, organization_name, project_id)
-    if project is not None:
-        project.project_progress = progress
-        await db.commit()
-        await db.refresh(project)
-    return progress
+
+
+async def reconcile_project_progress(db: AsyncSession) -> int:
+    """Rebuild the counters of every project with one GROUP BY; returns rows changed.
+
+    The organizations owning a drifted project are versioned (and locked)
+    first, as in every other write, and the rebuilt projects are stamped with
+    their organization's new version.
+    """
+    agg = _weights_by_project().subquery()
+    drifted = (
+        select(Project.organization_id)
+        .outerjoin(
+            agg,
+            and_(
+                agg.c.organization_id == Project.organization_id,
+                agg.c.project_id == Project.project_id,
+            ),
+        )
+        .where(
+            or_(
+                Project.total_weight != func.coalesce(agg.c.total_weight, 0),
+                Project.completed_weight != func.coalesce(agg.c.completed_weight, 0),
+            )
+        )
+    )
+    bumped = await db.execute(
+        update(Organization)
+        .where(Organization.id.in_(drifted))
+        .values(data_version=Organization.data_version + 1)
+        .returning(Organization.id)
+        .execution_options(synchronize_session=False)
+    )
+    organization_ids = bumped.scalars().all()
+    if not organization_ids:
+        await db.rollback()
+        return 0
+
+    stamp = {
+        "change_version": select(Organization.data_version)
+        .where(Organization.id == Project.organization_id)
+        .scalar_subquery(),
+    }
+    refreshed = await db.execute(
+        update(Project)
+        .where(
+            Project.organization_id.in_(organization_ids),
+            Project.organization_id == agg.c.organization_id,
+            Project.project_id == agg.c.project_id,
+            or_(
+                Project.total_weight != agg.c.total_weight,
+                Project.completed_weight != agg.c.completed_weight,
+            ),
+        )
+        .values(
+            total_weight=agg.c.total_weight,
+            completed_weight=agg.c.completed_weight,
+            project_progress=_progress_expr(agg.c.total_weight, agg.c.completed_weight),
+            **stamp,
+        )
+        .returning(Project.project_id)
+        .execution_options(synchronize_session=False)
+    )
+    emptied = await db.execute(
+        update(Project)
+        .where(
+            Project.organization_id.in_(organization_ids),
+            Project.total_weight != 0,
+            ~select(Task.task_id)
+            .where(
+                Task.organization_id == Project.organization_id,
+                Task.project_id == Project.project_id,
+            )
+            .exists(),
+        )
+        .values(total_weight=0, completed_weight=0, project_progress=0, **stamp)
+        .returning(Project.project_id)
+        .execution_options(synchronize_session=False)
+    )
+    changed = len(refreshed.all()) + len(emptied.all())
+    for organization_id in organization_ids:
+        await publish_invalidation(db, organization_id, "projects")
+    await db.commit()
+    return changed
@@ -0,0 +1,121 @@
+"""Delta sync: an organization's rows changed since a data version.
+
+Every write stamps the rows it touches (and a tombstone per deletion) with
+the organization ``data_version`` it bumped, so "changed since N" is a range
+scan of the ``(organization_id, change_version, <primary key>)`` indexes.
+"""
+from typing import Literal
+
+from sqlalchemy import Row, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import Page, paginate
+from app.database.models import Project, Task, TeamMember, Tombstone
+
+# Resources in the order a sync cycle returns them: parents before children,
+# deletions last.
+SYNC_RESOURCES = ("projects", "tasks", "members", "deleted")
+
+# Exactly the ``ProjectSyncRow`` / ``TaskSyncRow`` / ... fields, plus the
+# ``change_version`` that leads every sync key.
+PROJECT_SYNC_COLUMNS = (
+    Project.project_id,
+    Project.project_name,
+    Project.project_description,
+    Project.project_progress,
+    Project.created_by,
+    Project.updated_at,
+    Project.change_version,
+)
+TASK_SYNC_COLUMNS = (
+    Task.project_id,
+    Task.task_id,
+    Task.task_description,
+    Task.task_deadline,
+    Task.task_assigned_to,
+    Task.task_importance,
+    Task.task_completed,
+    Task.updated_at,
+    Task.change_version,
+)
+TEAM_MEMBER_SYNC_COLUMNS = (
+    TeamMember.member_id,
+    TeamMember.name,
+    TeamMember.email,
+    TeamMember.designation,
+    TeamMember.position,
+    TeamMember.updated_at,
+    TeamMember.change_version,
+)
+TOMBSTONE_COLUMNS = (
+    Tombstone.id,
+    Tombstone.resource,
+    Tombstone.project_id,
+    Tombstone.task_id,
+    Tombstone.deleted_at,
+    Tombstone.change_version,
+)
+
+# resource -> (model, selected columns, primary key after change_version)
+_SOURCES = {
+    "projects": (Project, PROJECT_SYNC_COLUMNS, (Project.project_id,)),
+    "tasks": (Task, TASK_SYNC_COLUMNS, (Task.project_id, Task.task_id)),
+    "members": (TeamMember, TEAM_MEMBER_SYNC_COLUMNS, (TeamMember.member_id,)),
+    "deleted": (Tombstone, TOMBSTONE_COLUMNS, (Tombstone.id,)),
+}
+
+# Length of each resource's cursor key: change_version then the primary key.
+SYNC_KEY_LENGTHS = {
+    resource: 1 + len(keys) for resource, (_, _, keys) in _SOURCES.items()
+}
+
+
+async def get_changes_page(
+    db: AsyncSession,
+    organization_id: int,
+    resource: str,
+    *,
+    since: int,
+    until: int,
+    limit: int,
+    after: list[int] | None = None,
+) -> Page[Row]:
+    """Rows of ``resource`` with ``since < change_version <= until``, in key order.
+
+    ``after`` is the last key of the previous page (see ``SYNC_KEY_LENGTHS``).
+    """
+    model, columns, keys = _SOURCES[resource]
+    order = (model.change_version, *keys)
+    stmt = select(*columns).where(
+        model.organization_id == organization_id,
+        model.change_version > since,
+        model.change_version <= until,
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(*order) > tuple_(*(literal(value) for value in after)))
+    result = await db.execute(stmt.order_by(*order).limit(limit + 1))
+    return paginate(
+        result.all(),
+        limit,
+        lambda row: [row.change_version, *(getattr(row, key.key) for key in keys)],
+    )
+
+
+async def record_deletion(
+    db: AsyncSession,
+    organization_id: int,
+    change_version: int,
+    resource: Literal["project", "task"],
+    project_id: int,
+    task_id: int | None = None,
+) -> None:
+    """Add the tombstone delta sync reports for a deleted row; caller commits."""
+    await db.execute(
+        insert(Tombstone).values(
+            organization_id=organization_id,
+            resource=resource,
+            project_id=project_id,
+            task_id=task_id,
+            change_version=change_version,
+        )
+    )
@@ -1,27 +1,167 @@
-from sqlalchemy import select
+from datetime import date
+
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import Task
+from app.core.invalidation import publish_invalidation
+from app.core.pagination import Page, limit_page, paginate
+from app.core.response_cache import invalidate_tasks
+from app.crud.organization import bump_tenant_data_version, set_organization_name
+from app.crud.project import apply_progress_delta, task_weight
+from app.crud.sync import record_deletion
+from app.database.models import Organization, Task
 
 
-async def get_tasks(
-    db: AsyncSession, organization_name: str, project_id: int
-) -> list[Task]:
-    result = await db.execute(
-        select(Task).where(
-            Task.organization_name == organization_name,
-            Task.project_id == project_id,
+# Cursor key types for each supported ``sort`` of ``get_tasks_page``.
+TASK_SORT_KEYS: dict[str, tuple[type, ...]] = {
+    "task_id": (int,),
+    "deadline": (date, int),
+    "importance": (int, int),
+}
+
+# Exactly the ``TaskOut`` fields. List reads select these as plain rows, with
+# the organization name from one join instead of a subquery per row.
+TASK_OUT_COLUMNS = (
+    Organization.name.label("organization_name"),
+    Task.project_id,
+    Task.task_id,
+    Task.task_description,
+    Task.task_deadline,
+    Task.task_assigned_to,
+    Task.task_importance,
+    Task.task_completed,
+)
+
+# NULL deadlines sort last under "deadline" ordering.
+_NO_DEADLINE = date(9999, 12, 31)
+_IMPORTANCE_RANKS = {"high": 3, "medium": 2, "low": 1}
+
+
+def _importance_rank() -> ColumnElement[int]:
+    return case(
+        *((Task.task_importance == name, rank) for name, rank in _IMPORTANCE_RANKS.items()),
+        else_=0,
+    )
+
+
+def _task_filters(
+    organization_id: int,
+    project_id: int,
+    *,
+    task_ids: list[int] | None = None,
+    assigned_to: int | None = None,
+    completed: bool | None = None,
+    importance: str | None = None,
+    deadline_from: date | None = None,
+    deadline_to: date | None = None,
+) -> list[ColumnElement[bool]]:
+    conditions = [
+        Task.organization_id == organization_id,
+        Task.project_id == project_id,
+    ]
+    if task_ids is not None:
+        conditions.append(Task.task_id.in_(task_ids))
+    if assigned_to is not None:
+        conditions.append(Task.task_assigned_to == assigned_to)
+    if completed is not None:
+        conditions.append(Task.task_completed.is_(completed))
+    if importance is not None:
+        conditions.append(Task.task_importance == importance)
+    if deadline_from is not None:
+        conditions.append(Task.task_deadline >= deadline_from)
+    if deadline_to is not None:
+        conditions.append(Task.task_deadline <= deadline_to)
+    return conditions
+
+
+async def get_tasks_page(
+    db: AsyncSession,
+    organization_id: int,
+    project_id: int,
+    *,
+    limit: int | None,
+    after: list | None = None,
+    sort: str = "task_id",
+    assigned_to: int | None = None,
+    completed: bool | None = None,
+    importance: str | None = None,
+    deadline_from: date | None = None,
+    deadline_to: date | None = None,
+) -> Page[Row]:
+    """Keyset-paginated, filtered task listing as ``TASK_OUT_COLUMNS`` rows.
+
+    ``after`` is the last key of the previous page, typed per ``TASK_SORT_KEYS``.
+    """
+    stmt = (
+        select(*TASK_OUT_COLUMNS)
+        .select_from(Task)
+        .join(Organization, Organization.id == Task.organization_id)
+        .where(
+            *_task_filters(
+                organization_id,
+                project_id,
+                assigned_to=assigned_to,
+                completed=completed,
+                importance=importance,
+                deadline_from=deadline_from,
+                deadline_to=deadline_to,
+            )
         )
     )
-    return list(result.scalars().all())
+
+    if sort == "deadline":
+        deadline = func.coalesce(Task.task_deadline, _NO_DEADLINE)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(deadline, Task.task_id) > tuple_(literal(after[0]), literal(after[1]))
+            )
+        stmt = stmt.order_by(deadline, Task.task_id)
+
+        def key(task: Row) -> list:
+            return [task.task_deadline or _NO_DEADLINE, task.task_id]
+
+    elif sort == "importance":
+        rank = _importance_rank()
+        if after is not None:
+            stmt = stmt.where(
+                or_(rank < after[0], and_(rank == after[0], Task.task_id > after[1]))
+            )
+        stmt = stmt.order_by(rank.desc(), Task.task_id)
+
+        def key(task: Row) -> list:
+            return [_IMPORTANCE_RANKS.get(task.task_importance, 0), task.task_id]
+
+    else:
+        if after is not None:
+            stmt = stmt.where(Task.task_id > after[0])
+        stmt = stmt.order_by(Task.task_id)
+
+        def key(task: Row) -> list:
+            return [task.task_id]
+
+    result = await db.execute(limit_page(stmt, limit))
+    return paginate(result.all(), limit, key)
 
 
 async def get_task(
-    db: AsyncSession, organization_name: str, project_id: int, task_id: int
+    db: AsyncSession, organization_id: int, project_id: int, task_id: int
 ) -> Task | None:
     result = await db.execute(
         select(Task).where(
-            Task.organization_name == organization_name,
+            Task.organization_id == organization_id,
             Task.project_id == project_id,
             Task.task_id == task_id,
         )
@@ -31,6 +171,7 @@ async def get_task(
 
 async def create_task(
     db: AsyncSession,
+    organization_id: int,
     organization_name: str,
     project_id: int,
     task_description: str,
@@ -38,28 +179,261 @@ async def create_task(
     task_assigned_to: int,
     task_importance: str | None,
 ) -> Task:
-    task = Task(
-        organization_name=organization_name,
-        project_id=project_id,
-        task_description=task_description,
-        task_deadline=task_deadline,
-        task_assigned_to=task_assigned_to,
-        task_importance=task_importance,
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        insert(Task)
+        .values(
+            organization_id=organization_id,
+            project_id=project_id,
+            task_description=task_description,
+            task_deadline=task_deadline,
+            task_assigned_to=task_assigned_to,
+            task_importance=task_importance,
+            change_version=version,
+        )
+        .returning(Task)
+    )
+    task = set_organization_name(result.scalar_one(), organization_name)
+    await apply_progress_delta(
+        db,
+        organization_id,
+        project_id,
+        task_weight(task_importance),
+        0,
+        change_version=version,
     )
-    db.add(task)
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
     await db.commit()
-    await db.refresh(task)
+    await invalidate_tasks(organization_id, project_id)
     return task
 
 
-async def update_task(db: AsyncSession, task: Task, data: dict) -> Task:
-    for key, value in data.items():
-        setattr(task, key, value)
+async def create_tasks(
+    db: AsyncSession, organization_id: int, project_id: int, tasks: list[dict]
+) -> list[int]:
+    """Insert ``tasks`` with one batched multi-row INSERT, adjust progress once and commit.
+
+    Returns the new task ids in the order of ``tasks``.
+    """
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        insert(Task).returning(Task.task_id, sort_by_parameter_order=True),
+        [
+            {
+                "organization_id": organization_id,
+                "project_id": project_id,
+                "change_version": version,
+                **task,
+            }
+            for task in tasks
+        ],
+    )
+    task_ids = list(result.scalars().all())
+    await apply_progress_delta(
+        db,
+        organization_id,
+        project_id,
+        sum(task_weight(task.get("task_importance")) for task in tasks),
+        0,
+        change_version=version,
+    )
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
     await db.commit()
-    await db.refresh(task)
+    await invalidate_tasks(organization_id, project_id)
+    return task_ids
+
+
+async def update_task(
+    db: AsyncSession,
+    organization_id: int,
+    project_id: int,
+    task_id: int,
+    data: dict,
+    assigned_to: int | None = None,
+) -> Task | None:
+    """Apply ``data`` with one UPDATE ... RETURNING and commit.
+
+    With ``assigned_to`` only a task assigned to that member is updated.
+    Returns None when no row matched.
+    """
+    if not data:
+        return await get_task(db, organization_id, project_id, task_id)
+
+    version = await bump_tenant_data_version(db, organization_id)
+    # Self-join on a locked snapshot of the row so RETURNING can report the
+    # pre-update importance/completion needed for the progress delta.
+    old = (
+        select(
+            Task.organization_id,
+            Task.project_id,
+            Task.task_id,
+            Task.task_importance,
+            Task.task_completed,
+        )
+        .where(
+            Task.organization_id == organization_id,
+            Task.project_id == project_id,
+            Task.task_id == task_id,
+        )
+        .with_for_update()
+        .subquery("old")
+    )
+    stmt = (
+        update(Task)
+        .where(
+            Task.organization_id == old.c.organization_id,
+            Task.project_id == old.c.project_id,
+            Task.task_id == old.c.task_id,
+        )
+        .values(**data, change_version=version)
+        .returning(
+            Task,
+            Task.organization_name,
+            old.c.task_importance,
+            old.c.task_completed,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if assigned_to is not None:
+        stmt = stmt.where(Task.task_assigned_to == assigned_to)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        await db.rollback()
+        return None
+
+    task, _, old_importance, old_completed = row
+    old_weight = task_weight(old_importance)
+    new_weight = task_weight(task.task_importance)
+    await apply_progress_delta(
+        db,
+        organization_id,
+        project_id,
+        new_weight - old_weight,
+        (new_weight if task.task_completed else 0)
+        - (old_weight if old_completed else 0),
+        change_version=version,
+    )
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
+    await db.commit()
+    await invalidate_tasks(organization_id, project_id)
     return task
 
 
-async def delete_task(db: AsyncSession, task: Task) -> None:
-    await db.delete(task)
+async def update_tasks(
+    db: AsyncSession,
+    organization_id: int,
+    project_id: int,
+    data: dict,
+    *,
+    task_ids: list[int] | None = None,
+    assigned_to: int | None = None,
+    completed: bool | None = None,
+    importance: str | None = None,
+    deadline_from: date | None = None,
+    deadline_to: date | None = None,
+) -> list[int]:
+    """Apply ``data`` to every matching task with one UPDATE, adjust progress once, commit.
+
+    Matching follows ``_task_filters``. Returns the updated task ids.
+    """
+    version = await bump_tenant_data_version(db, organization_id)
+    old = (
+        select(
+            Task.organization_id,
+            Task.project_id,
+            Task.task_id,
+            Task.task_importance,
+            Task.task_completed,
+        )
+        .where(
+            *_task_filters(
+                organization_id,
+                project_id,
+                task_ids=task_ids,
+                assigned_to=assigned_to,
+                completed=completed,
+                importance=importance,
+                deadline_from=deadline_from,
+                deadline_to=deadline_to,
+            )
+        )
+        .with_for_update()
+        .subquery("old")
+    )
+    result = await db.execute(
+        update(Task)
+        .where(
+            Task.organization_id == old.c.organization_id,
+            Task.project_id == old.c.project_id,
+            Task.task_id == old.c.task_id,
+        )
+        .values(**data, change_version=version)
+        .returning(
+            Task.task_id,
+            Task.task_importance,
+            Task.task_completed,
+            old.c.task_importance.label("old_importance"),
+            old.c.task_completed.label("old_completed"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return []
+
+    total_delta = 0
+    completed_delta = 0
+    for row in rows:
+        old_weight = task_weight(row.old_importance)
+        new_weight = task_weight(row.task_importance)
+        total_delta += new_weight - old_weight
+        completed_delta += (new_weight if row.task_completed else 0) - (
+            old_weight if row.old_completed else 0
+        )
+    await apply_progress_delta(
+        db,
+        organization_id,
+        project_id,
+        total_delta,
+        completed_delta,
+        change_version=version,
+    )
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
+    await db.commit()
+    await invalidate_tasks(organization_id, project_id)
+    return sorted(row.task_id for row in rows)
+
+
+async def delete_task(
+    db: AsyncSession, organization_id: int, project_id: int, task_id: int
+) -> bool:
+    version = await bump_tenant_data_version(db, organization_id)
+    result = await db.execute(
+        delete(Task)
+        .where(
+            Task.organization_id == organization_id,
+            Task.project_id == project_id,
+            Task.task_id == task_id,
+        )
+        .returning(Task.task_importance, Task.task_completed)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
+        await db.rollback()
+        return False
+    weight = task_weight(row.task_importance)
+    await apply_progress_delta(
+        db,
+        organization_id,
+        project_id,
+        -weight,
+        -weight if row.task_completed else 0,
+        change_version=version,
+    )
+    await record_deletion(db, organization_id, version, "task", project_id, task_id)
+    await publish_invalidation(db, organization_id, f"tasks:{project_id}")
     await db.commit()
+    await invalidate_tasks(organization_id, project_id)
+    return True
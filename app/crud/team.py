@@ -1,28 +1,95 @@
-from sqlalchemy import select, func, distinct
+from sqlalchemy import Row, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import TeamMember
+from app.core.cache import invalidate_user_principal
+from app.core.invalidation import publish_invalidation
+from app.core.pagination import Page, limit_page, paginate
+from app.core.response_cache import invalidate_teams
+from app.core.revocation import token_revocations
+from app.crud.organization import bump_data_version, set_organization_name
+from app.crud.user import revoke_tokens
+from app.database.models import Organization, TeamMember
 
+# 409 details for the constraints a new member can violate.
+MEMBER_CONFLICTS = {
+    "teams_user_id_unique": "User already belongs to an organization.",
+    "teams_org_email_unique": "A member with this email already exists in the organization.",
+    "teams_one_head_per_org": (
+        "Organization already has a head; change it with PATCH "
+        "/superuser/organizations/{organization_name}/head."
+    ),
+}
 
-async def get_team_members(db: AsyncSession, organization_name: str) -> list[TeamMember]:
+
+async def get_team_members(db: AsyncSession, organization_id: int) -> list[TeamMember]:
     result = await db.execute(
-        select(TeamMember).where(TeamMember.organization_name == organization_name)
+        select(TeamMember).where(TeamMember.organization_id == organization_id)
     )
     return list(result.scalars().all())
 
 
+# Exactly the ``TeamMemberOut`` fields, selected as plain rows for list reads.
+TEAM_MEMBER_OUT_COLUMNS = (
+    Organization.name.label("organization_name"),
+    TeamMember.member_id,
+    TeamMember.name,
+    TeamMember.email,
+    TeamMember.designation,
+    TeamMember.position,
+)
+
+
+async def get_team_members_page(
+    db: AsyncSession, organization_id: int, *, limit: int | None, after: list | None = None
+) -> Page[Row]:
+    stmt = (
+        select(*TEAM_MEMBER_OUT_COLUMNS)
+        .select_from(TeamMember)
+        .join(Organization, Organization.id == TeamMember.organization_id)
+        .where(TeamMember.organization_id == organization_id)
+    )
+    if after is not None:
+        stmt = stmt.where(TeamMember.member_id > after[0])
+    result = await db.execute(limit_page(stmt.order_by(TeamMember.member_id), limit))
+    return paginate(result.all(), limit, lambda member: [member.member_id])
+
+
 async def get_team_member_by_id(
-    db: AsyncSession, organization_name: str, member_id: int
+    db: AsyncSession, organization_id: int, member_id: int
 ) -> TeamMember | None:
     result = await db.execute(
         select(TeamMember).where(
-            TeamMember.organization_name == organization_name,
+            TeamMember.organization_id == organization_id,
             TeamMember.member_id == member_id,
         )
     )
     return result.scalar_one_or_none()
 
 
+async def get_existing_member_ids(
+    db: AsyncSession, organization_id: int, member_ids: set[int]
+) -> set[int]:
+    """Subset of ``member_ids`` that are members of the organization, in one query."""
+    result = await db.execute(
+        select(TeamMember.member_id).where(
+            TeamMember.organization_id == organization_id,
+            TeamMember.member_id.in_(member_ids),
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def get_member_user_ids(db: AsyncSession, user_ids: set[int]) -> set[int]:
+    """Which of ``user_ids`` already belong to an organization."""
+    if not user_ids:
+        return set()
+    result = await db.execute(
+        select(TeamMember.user_id).where(TeamMember.user_id.in_(user_ids))
+    )
+    return set(result.scalars().all())
+
+
 async def get_team_member_by_user_id(
     db: AsyncSession, user_id: int
 ) -> TeamMember | None:
@@ -31,19 +98,30 @@ async def get_team_member_by_user_id(
 
 
 async def get_team_member_by_email(
-    db: AsyncSession, organization_name: str, email: str
+    db: AsyncSession, organization_id: int, email: str
 ) -> TeamMember | None:
     result = await db.execute(
         select(TeamMember).where(
-            TeamMember.organization_name == organization_name,
+            TeamMember.organization_id == organization_id,
             TeamMember.email == email,
         )
     )
     return result.scalar_one_or_none()
 
 
+async def get_organization_head(db: AsyncSession, organization_id: int) -> TeamMember | None:
+    result = await db.execute(
+        select(TeamMember).where(
+            TeamMember.organization_id == organization_id,
+            TeamMember.position == "head",
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def create_team_member(
     db: AsyncSession,
+    organization_id: int,
     organization_name: str,
     name: str,
     email: str,
@@ -51,23 +129,63 @@ async def create_team_member(
     position: str,
     user_id: int,
 ) -> TeamMember:
-    member = TeamMember(
-        organization_name=organization_name,
-        name=name,
-        email=email,
-        designation=designation,
-        position=position,
-        user_id=user_id,
+    version = await bump_data_version(db, organization_id)
+    result = await db.execute(
+        insert(TeamMember)
+        .values(
+            organization_id=organization_id,
+            name=name,
+            email=email,
+            designation=designation,
+            position=position,
+            user_id=user_id,
+            change_version=version,
+        )
+        .returning(TeamMember)
     )
-    db.add(member)
+    member = set_organization_name(result.scalar_one(), organization_name)
+    # Tokens issued before the user joined carry no organization.
+    revoked = await revoke_tokens(db, [user_id])
+    await publish_invalidation(db, organization_id, "teams", f"user:{user_id}")
     await db.commit()
-    await db.refresh(member)
+    token_revocations.revoke(revoked)
+    invalidate_user_principal(user_id)
+    await invalidate_teams(organization_id)
     return member
 
 
-async def get_all_organizations(db: AsyncSession) -> list[str]:
-    """Get all distinct organization names."""
+async def create_team_members(
+    db: AsyncSession, organization_id: int, members: list[dict]
+) -> tuple[dict[str, int], dict[int, float]]:
+    """Multi-row INSERT of ``member`` rows; emails already in the org and users
+    already in any organization are skipped.
+
+    Returns the user ids actually added, keyed by email, and the revocation
+    of their existing tokens. Caller commits and applies the revocation to
+    ``token_revocations``.
+    """
+    if not members:
+        return {}, {}
+    version = await bump_data_version(db, organization_id)
     result = await db.execute(
-        select(distinct(TeamMember.organization_name))
+        pg_insert(TeamMember)
+        .values(
+            [
+                {
+                    **member,
+                    "organization_id": organization_id,
+                    "position": "member",
+                    "change_version": version,
+                }
+                for member in members
+            ]
+        )
+        .on_conflict_do_nothing()
+        .returning(TeamMember.email, TeamMember.user_id)
+    )
+    added = {email: user_id for email, user_id in result.all()}
+    revoked = await revoke_tokens(db, list(added.values())) if added else {}
+    await publish_invalidation(
+        db, organization_id, "teams", *(f"user:{user_id}" for user_id in added.values())
     )
-    return [row[0] for row in result.all()]
+    return added, revoked
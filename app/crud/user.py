@@ -1,8 +1,13 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
-from app.database.models import User
+from app.core.hashing import password_hasher
+from app.core.logging import log_event
+from app.database.models import TeamMember, User
+from app.database.session import release_connection
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
@@ -13,26 +18,92 @@ async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
 async def create_user(
     db: AsyncSession, email: str, password: str, is_superuser: bool
 ) -> User:
-    # #region agent log
-    import json
-    with open('/Users/shivanshmahajan/Developer/workflowz_ai/.cursor/debug.log', 'a') as f:
-        f.write(json.dumps({"sessionId":"debug-session","runId":"run1","hypothesisId":"B","location":"user.py:13","message":"create_user entry","data":{"password_len_chars":len(password),"password_len_bytes":len(password.encode('utf-8'))},"timestamp":1733456789002})+'\n')
-    # #endregion
-    user = User(
-        email=email,
-        hashed_password=get_password_hash(password),
-        is_superuser=is_superuser,
+    # Callers look the email up first; do not hold that transaction's
+    # connection while bcrypt runs.
+    await release_connection(db)
+    hashed_password = await password_hasher.hash(password)
+    result = await db.execute(
+        insert(User)
+        .values(email=email, hashed_password=hashed_password, is_superuser=is_superuser)
+        .returning(User)
     )
-    db.add(user)
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(user)
+    log_event("user.created", user_id=user.id, is_superuser=is_superuser)
     return user
 
 
+async def get_user_ids_by_email(db: AsyncSession, emails: list[str]) -> dict[str, int]:
+    result = await db.execute(select(User.email, User.id).where(User.email.in_(emails)))
+    return {email: user_id for email, user_id in result.all()}
+
+
+async def create_users(db: AsyncSession, users: list[dict]) -> dict[str, int]:
+    """Multi-row INSERT of pre-hashed users; existing emails are skipped. Caller commits.
+
+    Returns the ids of the rows actually inserted, keyed by email.
+    """
+    if not users:
+        return {}
+    result = await db.execute(
+        pg_insert(User)
+        .values(users)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.email, User.id)
+    )
+    return {email: user_id for email, user_id in result.all()}
+
+
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
     user = await get_user_by_email(db, email)
+    await release_connection(db)
     if user is None:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await password_hasher.verify(password, user.hashed_password):
         return None
     return user
+
+
+async def load_token_revocations(db: AsyncSession, since: datetime) -> dict[int, float]:
+    """Return the users whose tokens were revoked after ``since``."""
+    result = await db.execute(
+        select(User.id, User.tokens_valid_after).where(User.tokens_valid_after > since)
+    )
+    return {user_id: valid_after.timestamp() for user_id, valid_after in result.all()}
+
+
+async def revoke_tokens(db: AsyncSession, user_ids: list[int]) -> dict[int, float]:
+    """Stop trusting the org claims of the users' existing tokens; caller commits."""
+    revoked_at = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(tokens_valid_after=revoked_at)
+        .returning(User.id)
+    )
+    return {user_id: revoked_at.timestamp() for user_id in result.scalars()}
+
+
+async def revoke_organization_tokens(
+    db: AsyncSession, organization_id: int
+) -> dict[int, float]:
+    """Revoke every member's tokens of an organization; caller commits."""
+    revoked_at = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(TeamMember.user_id).where(
+                    TeamMember.organization_id == organization_id
+                )
+            )
+        )
+        .values(tokens_valid_after=revoked_at)
+        .returning(User.id)
+    )
+    return {user_id: revoked_at.timestamp() for user_id in result.scalars()}
+
+
+async def any_user_exists(db: AsyncSession) -> bool:
+    result = await db.execute(select(select(User.id).exists()))
+    return bool(result.scalar())
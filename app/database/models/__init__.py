@@ -2,19 +2,30 @@ from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Date,
     DateTime,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
+    select,
+    text,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    column_property,
+    mapped_column,
+    relationship,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
@@ -23,11 +34,22 @@ class Base(DeclarativeBase):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Token revocation refreshes read only recently revoked users.
+        Index(
+            "ix_users_tokens_valid_after",
+            "tokens_valid_after",
+            postgresql_where=text("tokens_valid_after IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Org claims of tokens issued before this are not trusted (see
+    # app.core.revocation).
+    tokens_valid_after: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     team_members: Mapped[list["TeamMember"]] = relationship(
@@ -35,17 +57,76 @@ class User(Base):
     )
 
 
+class Organization(Base):
+    __tablename__ = "organizations"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Bumped first in the same transaction as every write to the organization's
+    # projects, tasks or members, so the row lock orders those writes; list
+    # ETags and delta-sync versions are derived from it.
+    data_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    # Database holding the organization's projects and tasks, by name in
+    # DATABASE_SHARDS; NULL is the default shard (see app.core.sharding).
+    shard: Mapped[Optional[str]] = mapped_column(String(50))
+
+
+def _organization_name(organization_id):
+    """Read-only ``organization_name`` resolved from ``organizations`` at load time.
+
+    Tenant rows are keyed by the integer ``organization_id``, so renaming an
+    organization touches a single row. INSERT ... RETURNING cannot correlate
+    this subquery; write paths fill it in explicitly (see app.crud.organization).
+    """
+    return column_property(
+        select(Organization.name)
+        .where(Organization.id == organization_id)
+        .correlate_except(Organization)
+        .scalar_subquery(),
+        # Flushing a tenant row never changes its organization's name.
+        expire_on_flush=False,
+    )
+
+
+def _updated_at():
+    return mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+def _change_version():
+    """The organization ``data_version`` of the transaction that last wrote the row.
+
+    Delta sync (app.crud.sync) returns the rows whose version is newer than
+    the client's cursor.
+    """
+    return mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+
 class TeamMember(Base):
     __tablename__ = "teams"
     __table_args__ = (
-        UniqueConstraint("organization_name", "email", name="teams_org_email_unique"),
+        UniqueConstraint("organization_id", "email", name="teams_org_email_unique"),
+        # One organization per user (load_principal reads a single membership).
+        UniqueConstraint("user_id", name="teams_user_id_unique"),
         CheckConstraint(
             "position IN ('head', 'member')",
             name="teams_position_check",
         ),
+        Index(
+            "teams_one_head_per_org",
+            "organization_id",
+            unique=True,
+            postgresql_where=text("position = 'head'"),
+        ),
+        Index("ix_teams_org_position", "organization_id", "position"),
+        Index("ix_teams_org_change_version", "organization_id", "change_version", "member_id"),
     )
 
-    organization_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
     member_id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
@@ -55,6 +136,10 @@ class TeamMember(Base):
     position: Mapped[str] = mapped_column(String(50), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = _updated_at()
+    change_version: Mapped[int] = _change_version()
+
+    organization_name: Mapped[str] = _organization_name(organization_id)
 
     user: Mapped["User"] = relationship(back_populates="team_members")
 
@@ -63,37 +148,54 @@ class Project(Base):
     __tablename__ = "projects"
     __table_args__ = (
         UniqueConstraint(
-            "organization_name", "project_name", name="projects_org_name_unique"
+            "organization_id", "project_name", name="projects_org_name_unique"
         ),
         CheckConstraint(
             "project_progress BETWEEN 0 AND 100",
             name="projects_progress_range",
         ),
+        Index(
+            "ix_projects_org_change_version", "organization_id", "change_version", "project_id"
+        ),
     )
 
-    organization_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
     project_id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
     project_name: Mapped[str] = mapped_column(String(100), nullable=False)
     project_description: Mapped[Optional[str]] = mapped_column(Text)
     project_progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Importance-weighted task totals kept in step by every task write
+    # (see app.crud.project.apply_progress_delta).
+    total_weight: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    completed_weight: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_by: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = _updated_at()
+    change_version: Mapped[int] = _change_version()
+
+    organization_name: Mapped[str] = _organization_name(organization_id)
 
 
 class Task(Base):
     __tablename__ = "tasks"
     __table_args__ = (
         ForeignKeyConstraint(
-            ["organization_name", "project_id"],
-            ["projects.organization_name", "projects.project_id"],
+            ["organization_id", "project_id"],
+            ["projects.organization_id", "projects.project_id"],
             name="tasks_project_fk",
             ondelete="CASCADE",
         ),
         ForeignKeyConstraint(
-            ["organization_name", "task_assigned_to"],
-            ["teams.organization_name", "teams.member_id"],
+            ["organization_id", "task_assigned_to"],
+            ["teams.organization_id", "teams.member_id"],
             name="tasks_assignee_fk",
             ondelete="RESTRICT",
         ),
@@ -101,9 +203,27 @@ class Task(Base):
             "task_importance IN ('high', 'medium', 'low') OR task_importance IS NULL",
             name="tasks_importance_check",
         ),
+        Index(
+            "ix_tasks_org_project_assignee",
+            "organization_id",
+            "project_id",
+            "task_assigned_to",
+        ),
+        # Supports tasks_assignee_fk so deleting a team member does not scan tasks.
+        Index("ix_tasks_org_assignee", "organization_id", "task_assigned_to"),
+        Index(
+            "ix_tasks_org_change_version",
+            "organization_id",
+            "change_version",
+            "project_id",
+            "task_id",
+        ),
+        # One heap (and vacuum/index workload) per hash bucket of tenants; every
+        # task query filters on organization_id, so the planner prunes to one.
+        {"postgresql_partition_by": "HASH (organization_id)"},
     )
 
-    organization_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     project_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     task_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_description: Mapped[str] = mapped_column(Text, nullable=False)
@@ -112,5 +232,50 @@ class Task(Base):
     task_importance: Mapped[Optional[str]] = mapped_column(String(50))
     task_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = _updated_at()
+    change_version: Mapped[int] = _change_version()
+
+    organization_name: Mapped[str] = _organization_name(organization_id)
+
+
+class Tombstone(Base):
+    """A deleted project or task, kept so delta sync can report the deletion.
+
+    Deleting a project cascades to its tasks without a tombstone per task;
+    clients drop a deleted project's tasks themselves.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        CheckConstraint(
+            "resource IN ('project', 'task')",
+            name="tombstones_resource_check",
+        ),
+        Index("ix_tombstones_org_change_version", "organization_id", "change_version", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    resource: Mapped[str] = mapped_column(String(20), nullable=False)
+    project_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    task_id: Mapped[Optional[int]] = mapped_column(Integer)
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+# Hash partitions of ``tasks`` (tasks_p0 .. tasks_p{N-1}). Migrations create
+# them for real databases; this hook covers ``metadata.create_all``.
+TASK_PARTITIONS = 16
 
 
+@event.listens_for(Task.__table__, "after_create")
+def _create_task_partitions(target, connection, **kw) -> None:
+    for remainder in range(TASK_PARTITIONS):
+        connection.execute(
+            text(
+                f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks "
+                f"FOR VALUES WITH (MODULUS {TASK_PARTITIONS}, REMAINDER {remainder})"
+            )
+        )
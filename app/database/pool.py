@@ -0,0 +1,122 @@
+"""Connection pool instrumentation reported under ``db_pool`` on ``/metrics``.
+
+Checkouts are also attributed to the route being served
+(``db_checkouts_by_route``): how long it waited for a connection and how long
+it then held it, which is the time the pool was one connection short.
+"""
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, MutableMapping
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram, register_metrics
+
+# Waits are short when the pool is healthy; the tail shows exhaustion.
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000)
+HELD_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 30000)
+
+# ASGI scope of the request being served (see app.database.session.track_route);
+# its "route" is filled in once the router has matched.
+current_request: ContextVar[MutableMapping[str, Any] | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+def current_route() -> str:
+    scope = current_request.get()
+    if scope is None:
+        return "background"
+    path = getattr(scope.get("route"), "path", None)
+    return f"{scope['method']} {path}" if path else "unmatched"
+
+
+class RouteCheckouts:
+    """Checkout wait and hold time per route, over every pool."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, tuple[Histogram, Histogram]] = {}
+
+    def _histograms(self, route: str) -> tuple[Histogram, Histogram]:
+        histograms = self._routes.get(route)
+        if histograms is None:
+            histograms = self._routes[route] = (
+                Histogram(WAIT_BUCKETS_MS),
+                Histogram(HELD_BUCKETS_MS),
+            )
+        return histograms
+
+    def observe_wait(self, route: str, wait_ms: float) -> None:
+        self._histograms(route)[0].observe(wait_ms)
+
+    def observe_held(self, route: str, held_ms: float) -> None:
+        self._histograms(route)[1].observe(held_ms)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            route: {"wait_ms": wait.snapshot(), "held_ms": held.snapshot()}
+            for route, (wait, held) in sorted(self._routes.items())
+        }
+
+
+route_checkouts = RouteCheckouts()
+register_metrics("db_checkouts_by_route", route_checkouts.stats)
+
+
+def _on_checkout(dbapi_connection, record, proxy) -> None:
+    record.info["checked_out"] = (perf_counter(), current_route())
+
+
+def _on_checkin(dbapi_connection, record) -> None:
+    checked_out = record.info.pop("checked_out", None)
+    if checked_out is not None:
+        started, route = checked_out
+        route_checkouts.observe_held(route, (perf_counter() - started) * 1000)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that times every checkout.
+
+    The wait covers queueing for a free connection, opening a new one when
+    the pool is below its limit, and the pre-ping.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.timeouts = 0
+        if "_dispatch" not in kwargs:
+            # recreate() hands the new pool these listeners with its dispatch.
+            event.listen(self, "checkout", _on_checkout)
+            event.listen(self, "checkin", _on_checkin)
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() swaps in a new pool; keep counting where we were.
+        pool = super().recreate()
+        pool.wait_ms, pool.timeouts = self.wait_ms, self.timeouts
+        return pool
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait_ms = (perf_counter() - started) * 1000
+            self.wait_ms.observe(wait_ms)
+            route_checkouts.observe_wait(current_route(), wait_ms)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
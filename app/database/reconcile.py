@@ -0,0 +1,26 @@
+"""Rebuild persisted project progress counters from the tasks table.
+
+Runs against the default database and every shard in ``DATABASE_SHARDS``.
+
+Usage:
+    python -m app.database.reconcile
+"""
+import asyncio
+
+from app.core.config import settings
+from app.core.sharding import DEFAULT_SHARD
+from app.crud.project import reconcile_project_progress
+from app.database.session import dispose_shard_engines, engine, shard_sessionmaker
+
+
+async def main() -> None:
+    for shard in (DEFAULT_SHARD, *settings.DATABASE_SHARDS):
+        async with shard_sessionmaker(shard)() as session:
+            changed = await reconcile_project_progress(session)
+        print(f"Reconciled {changed} project(s) on {shard!r}.")
+    await dispose_shard_engines()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,229 @@
-from typing import AsyncGenerator
+import logging
+import re
+from typing import Any, AsyncGenerator, Awaitable, Callable
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncpg
+from fastapi import Depends, Request, Response
+from sqlalchemy import make_url, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
+from app.core.invalidation import track_writes
+from app.core.logging import log_event
+from app.core.metrics import register_metrics
+from app.core.sharding import DEFAULT_SHARD
+from app.database.pool import InstrumentedPool, current_request
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+
+def _connect_args() -> dict[str, Any]:
+    if settings.DB_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+register_metrics("db_pool", lambda: engine.pool.stats())
+
+# Optional streaming replica for the read-only list routes (see get_read_db).
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+if replica_engine is not None:
+    register_metrics("db_pool_replica", lambda: replica_engine.pool.stats())
+
+
+# Tenant shards other than "default" (DATABASE_URL), opened on first use.
+_shard_engines: dict[str, AsyncEngine] = {}
+_shard_sessions: dict[str, async_sessionmaker[AsyncSession]] = {}
+
+
+def shard_sessionmaker(shard: str) -> async_sessionmaker[AsyncSession]:
+    """Session factory for a shard named in ``DATABASE_SHARDS`` (or ``"default"``)."""
+    if shard == DEFAULT_SHARD:
+        return AsyncSessionLocal
+    factory = _shard_sessions.get(shard)
+    if factory is None:
+        url = settings.DATABASE_SHARDS.get(shard)
+        if url is None:
+            raise RuntimeError(f"Unknown database shard {shard!r}; add it to DATABASE_SHARDS.")
+        _shard_engines[shard] = _create_engine(url)
+        factory = _shard_sessions[shard] = async_sessionmaker(
+            _shard_engines[shard], class_=AsyncSession, expire_on_commit=False
+        )
+    return factory
+
+
+async def dispose_shard_engines() -> None:
+    for shard_engine in _shard_engines.values():
+        await shard_engine.dispose()
+
+
+register_metrics(
+    "db_pool_shards",
+    lambda: {shard: shard_engine.pool.stats() for shard, shard_engine in _shard_engines.items()},
+)
+
+
+async def connect_listener(shard: str = DEFAULT_SHARD) -> asyncpg.Connection:
+    """A driver connection to a shard's database outside the pool, for LISTEN."""
+    if shard == DEFAULT_SHARD:
+        url = settings.DATABASE_LISTEN_URL or engine.url
+    else:
+        url = settings.DATABASE_SHARD_LISTEN_URLS.get(shard) or settings.DATABASE_SHARDS[shard]
+    args, kwargs = engine.dialect.create_connect_args(make_url(url))
+    return await asyncpg.connect(*args, **kwargs)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def violated_constraint(exc: IntegrityError) -> str | None:
+    """Name of the constraint behind an ``IntegrityError``, as asyncpg reports it."""
+    return getattr(getattr(exc.orig, "orig", None), "constraint_name", None)
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """End the session's read transaction so its connection goes back to the pool.
+
+    Request sessions close only after the response has been sent; call this
+    once a route's last query is done, before CPU-bound work (password
+    hashing, serializing a page). Loaded objects stay usable
+    (``expire_on_commit=False``) and a later query checks out a connection
+    again. Not for sessions with pending writes: those commit.
+    """
+    if db.in_transaction():
+        await db.commit()
+
+
+async def track_route(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """HTTP middleware: attribute pool checkouts to the route being served."""
+    token = current_request.set(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        current_request.reset(token)
+
+
+# Read-your-writes: a successful write returns the primary's WAL position,
+# and the client sends it back on its reads (cookie for browsers, header
+# for API clients).
+WRITE_LSN_HEADER = "X-Write-LSN"
+WRITE_LSN_COOKIE = "wf_write_lsn"
+_LSN_PATTERN = re.compile(r"^[0-9A-F]{1,8}/[0-9A-F]{1,8}$")
+
+# On a primary (e.g. a replica URL pointing at it) there is no replay
+# position; its current position is trivially "caught up".
+_REPLAYED = text(
+    "SELECT COALESCE(pg_last_wal_replay_lsn(), pg_current_wal_lsn())"
+    " >= CAST(CAST(:lsn AS text) AS pg_lsn)"
+)
+
+read_routing = {"replica": 0, "primary_sticky": 0, "primary_fallback": 0}
+if replica_engine is not None:
+    register_metrics("read_routing", lambda: dict(read_routing))
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: the replica, unless it may miss the caller's writes.
+
+    Without ``DATABASE_REPLICA_URL`` this is the request's ``get_db`` session.
+    A request carrying a write LSN is served by the replica only once it has
+    replayed that far; otherwise, or if no replica connection can be checked
+    out, by the primary (again the ``get_db`` session, which the principal
+    lookup shares).
+    """
+    if ReplicaSessionLocal is None:
+        yield db
+        return
+
+    lsn = request.headers.get(WRITE_LSN_HEADER) or request.cookies.get(WRITE_LSN_COOKIE)
+    if lsn is not None and not _LSN_PATTERN.match(lsn):
+        lsn = None
+    async with ReplicaSessionLocal() as session:
+        try:
+            if lsn is None:
+                # Check out (and pre-ping) now, so a replica that is down
+                # falls back here rather than failing the route's query.
+                await session.connection()
+                use_replica = True
+            else:
+                use_replica = bool(
+                    (await session.execute(_REPLAYED, {"lsn": lsn})).scalar_one()
+                )
+                if not use_replica:
+                    read_routing["primary_sticky"] += 1
+        except (OSError, SQLAlchemyError) as exc:
+            use_replica = False
+            read_routing["primary_fallback"] += 1
+            log_event("replica.unavailable", level=logging.WARNING, error=type(exc).__name__)
+        if use_replica:
+            read_routing["replica"] += 1
+            yield session
+            return
+    yield db
+
+
+async def remember_write_lsn(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """HTTP middleware: tag successful writes with the primary's current WAL LSN.
+
+    Only requests that changed data on the primary (they published an
+    invalidation there) pay for the lookup; logins, signups and writes to
+    other shards, none of which the replica serves back, do not.
+    """
+    with track_writes() as published_on:
+        response = await call_next(request)
+    if engine in published_on and response.status_code < 400:
+        async with engine.connect() as connection:
+            lsn = (await connection.execute(text("SELECT pg_current_wal_lsn()::text"))).scalar_one()
+        response.headers[WRITE_LSN_HEADER] = lsn
+        response.set_cookie(
+            WRITE_LSN_COOKIE,
+            lsn,
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
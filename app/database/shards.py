@@ -0,0 +1,295 @@
+"""Tenant shard placement, membership mirroring and tenant moves.
+
+A shard other than ``default`` runs the same migrations as the directory
+(``DATABASE_URL``). For each organization placed on it, it holds the
+projects, tasks and tombstones, plus a mirror of the organization row, its
+members and stub rows for their users (so the foreign keys hold and delta
+sync can read members next to tasks). Membership is only ever written to the
+directory; every route that changes it calls ``mirror_committed_membership``
+after committing, which answers 503 with the ``mirror`` command below if the
+copy fails.
+
+Usage:
+    python -m app.database.shards move <organization name> <shard>
+    python -m app.database.shards mirror <organization name>
+
+``move`` copies the organization to the target shard, points the directory
+at it and then deletes the copy it left behind. Writes to the organization
+wait for it and then fail with a 503 until every worker routes them to the
+target (see ``bump_tenant_data_version``); stop them while it runs.
+"""
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import delete, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import service_unavailable
+from app.core.invalidation import publish_invalidation
+from app.core.logging import log_event
+from app.core.sharding import DEFAULT_SHARD, shard_directory
+from app.crud.organization import (
+    bump_data_version,
+    get_organization_by_name,
+    get_shard_placements,
+    rename_organization,
+)
+from app.database.models import Organization, Project, Task, TeamMember, Tombstone, User
+from app.database.session import (
+    AsyncSessionLocal,
+    dispose_shard_engines,
+    engine,
+    shard_sessionmaker,
+)
+
+# Mirrored users only satisfy teams.user_id; nobody logs in against a shard.
+STUB_PASSWORD_HASH = "!"
+
+# Tenant tables copied by ``move``, parents first; ``teams`` comes from
+# ``mirror_membership``.
+TENANT_TABLES = (Project.__table__, Task.__table__, Tombstone.__table__)
+
+# Serial columns whose sequence must stay ahead of copied ids on the target.
+SERIAL_COLUMNS = (("projects", "project_id"), ("tasks", "task_id"), ("tombstones", "id"))
+
+MIRRORED_MEMBER_COLUMNS = ("name", "email", "designation", "position", "user_id")
+
+
+async def get_tenant_shard(
+    db: AsyncSession, *, organization_id: int | None = None, organization_name: str | None = None
+) -> str:
+    """Shard of an organization, by id or name; ``db`` is a directory session."""
+    if shard_directory.is_stale():
+        shard_directory.replace(
+            await get_shard_placements(db, settings.TENANT_SHARD_OVERRIDES)
+        )
+    if organization_id is not None:
+        return shard_directory.shard_of(organization_id)
+    if organization_name is not None:
+        return shard_directory.shard_of_name(organization_name)
+    return DEFAULT_SHARD
+
+
+async def _copy_membership(
+    directory: AsyncSession, shard: AsyncSession, organization_id: int
+) -> int:
+    """Upsert the organization row, members and member users; caller commits ``shard``."""
+    organization = (
+        await directory.execute(
+            select(Organization.id, Organization.name, Organization.data_version).where(
+                Organization.id == organization_id
+            )
+        )
+    ).one()
+    members = (
+        await directory.execute(
+            select(TeamMember.__table__).where(TeamMember.organization_id == organization_id)
+        )
+    ).mappings().all()
+    users = (
+        await directory.execute(
+            select(User.id, User.email).where(User.id.in_([m["user_id"] for m in members]))
+        )
+    ).all()
+
+    await shard.execute(
+        pg_insert(Organization)
+        .values(id=organization.id, name=organization.name, data_version=organization.data_version)
+        .on_conflict_do_nothing(index_elements=[Organization.id])
+    )
+    current_name = (
+        await shard.execute(select(Organization.name).where(Organization.id == organization_id))
+    ).scalar_one()
+    if current_name != organization.name:
+        await rename_organization(shard, organization_id, organization.name)
+    version = await bump_data_version(shard, organization_id)
+
+    if users:
+        stmt = pg_insert(User).values(
+            [
+                {"id": user.id, "email": user.email, "hashed_password": STUB_PASSWORD_HASH}
+                for user in users
+            ]
+        )
+        await shard.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[User.id], set_={"email": stmt.excluded.email}
+            )
+        )
+    if members:
+        stmt = pg_insert(TeamMember).values(
+            [{**member, "change_version": version} for member in members]
+        )
+        changed = or_(
+            *(
+                TeamMember.__table__.c[column].is_distinct_from(stmt.excluded[column])
+                for column in MIRRORED_MEMBER_COLUMNS
+            )
+        )
+        await shard.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TeamMember.organization_id, TeamMember.member_id],
+                set_={
+                    **{column: stmt.excluded[column] for column in MIRRORED_MEMBER_COLUMNS},
+                    "change_version": stmt.excluded.change_version,
+                    "updated_at": func.now(),
+                },
+                where=changed,
+            )
+        )
+    return version
+
+
+async def mirror_membership(organization_id: int, shard: str) -> None:
+    """Copy the directory's view of the organization's members to its shard.
+
+    Nothing to do on the default shard. Members are never deleted, so the
+    mirror only inserts and updates.
+    """
+    if shard == DEFAULT_SHARD:
+        return
+    async with AsyncSessionLocal() as directory, shard_sessionmaker(shard)() as target:
+        await _copy_membership(directory, target, organization_id)
+        await target.commit()
+
+
+async def mirror_committed_membership(
+    organization_id: int, organization_name: str, shard: str
+) -> None:
+    """``mirror_membership`` for a route whose membership write has committed.
+
+    Retrying that write would conflict, so a failed copy is reported as a 503
+    naming the command that brings the shard up to date.
+    """
+    try:
+        await mirror_membership(organization_id, shard)
+    except Exception as exc:
+        log_event(
+            "shards.mirror_failed",
+            level=logging.ERROR,
+            organization_id=organization_id,
+            shard=shard,
+            error=type(exc).__name__,
+        )
+        raise service_unavailable(
+            f"The change was saved, but copying the members of {organization_name!r} "
+            f"to shard {shard!r} failed; run "
+            f'`python -m app.database.shards mirror "{organization_name}"`.'
+        ) from exc
+
+
+async def _delete_tenant_rows(db: AsyncSession, organization_id: int) -> None:
+    # Projects go first: their tasks reference the members.
+    await db.execute(delete(Project).where(Project.organization_id == organization_id))
+    await db.execute(delete(Tombstone).where(Tombstone.organization_id == organization_id))
+
+
+async def _advance_sequences(db: AsyncSession) -> None:
+    for table, column in SERIAL_COLUMNS:
+        await db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'),"
+                f" GREATEST((SELECT COALESCE(MAX({column}), 0) FROM {table}), 1))"
+            )
+        )
+
+
+async def move_organization(name: str, target_shard: str) -> None:
+    async with AsyncSessionLocal() as directory:
+        organization = await get_organization_by_name(directory, name)
+        if organization is None:
+            raise SystemExit(f"Organization {name!r} not found.")
+        if organization.id in settings.TENANT_SHARD_OVERRIDES:
+            raise SystemExit(f"{name!r} is pinned by TENANT_SHARD_OVERRIDES; change that instead.")
+        source_shard = organization.shard or DEFAULT_SHARD
+        if source_shard == target_shard:
+            raise SystemExit(f"{name!r} is already on {target_shard!r}.")
+        organization_id = organization.id
+        await directory.commit()
+
+        # The directory doubles as the default shard: reuse its session so no
+        # transaction waits on a lock held by another one of ours.
+        async with shard_sessionmaker(source_shard)() as own_source, shard_sessionmaker(
+            target_shard
+        )() as own_target:
+            source = directory if source_shard == DEFAULT_SHARD else own_source
+            target = directory if target_shard == DEFAULT_SHARD else own_target
+            # Lock the source organization row until the old copy is gone:
+            # writes queue behind it, then find the row moved (shard set on
+            # the directory, deleted elsewhere) and fail instead of landing
+            # in the old copy.
+            data_version = (
+                await source.execute(
+                    select(Organization.data_version)
+                    .where(Organization.id == organization_id)
+                    .with_for_update()
+                )
+            ).scalar_one()
+            if target is not directory:
+                await _copy_membership(directory, target, organization_id)
+            await target.execute(
+                update(Organization)
+                .where(Organization.id == organization_id)
+                .values(data_version=func.greatest(Organization.data_version, data_version))
+            )
+            for table in TENANT_TABLES:
+                rows = (
+                    await source.execute(
+                        select(table).where(table.c.organization_id == organization_id)
+                    )
+                ).mappings().all()
+                if rows:
+                    await target.execute(pg_insert(table).on_conflict_do_nothing(), list(rows))
+            await _advance_sequences(target)
+            if target is not directory:
+                await target.commit()
+
+            await directory.execute(
+                update(Organization)
+                .where(Organization.id == organization_id)
+                .values(shard=None if target_shard == DEFAULT_SHARD else target_shard)
+            )
+            await publish_invalidation(directory, organization_id, "shards")
+            if source is directory:
+                # Committing releases the lock, so drop the old copy in the
+                # same transaction as the switch.
+                await _delete_tenant_rows(directory, organization_id)
+            await directory.commit()
+
+            shard_directory.expire()
+
+            if source is not directory:
+                # The directory now routes to the target; drop the old copy
+                # with the mirrored members, still under the lock.
+                await _delete_tenant_rows(source, organization_id)
+                await source.execute(
+                    delete(Organization).where(Organization.id == organization_id)
+                )
+                await source.commit()
+    print(f"Moved {name!r} from {source_shard!r} to {target_shard!r}.")
+
+
+async def main(argv: list[str]) -> None:
+    try:
+        if len(argv) == 3 and argv[0] == "move":
+            await move_organization(argv[1], argv[2])
+        elif len(argv) == 2 and argv[0] == "mirror":
+            async with AsyncSessionLocal() as directory:
+                organization = await get_organization_by_name(directory, argv[1])
+                if organization is None:
+                    raise SystemExit(f"Organization {argv[1]!r} not found.")
+                shard = await get_tenant_shard(directory, organization_id=organization.id)
+            await mirror_membership(organization.id, shard)
+            print(f"Mirrored {argv[1]!r} to {shard!r}.")
+        else:
+            raise SystemExit(__doc__)
+    finally:
+        await dispose_shard_engines()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
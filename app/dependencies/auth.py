@@ -1,59 +1,144 @@
+"""Dependency utilities."""
+import time
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import principal_cache
 from app.core.config import settings
+from app.core.revocation import token_revocations
+from app.crud.user import load_token_revocations
 from app.database.models import User
-from app.database.session import get_db
-from app.dependencies.tenancy import OrgContext, get_org_context
+from app.database.session import get_db, release_connection
+from app.dependencies.tenancy import OrgContext, Principal, load_principal
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/token")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict[str, Any]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str | None = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
+            raise _credentials_exception()
+        TokenData(email=email)
     except JWTError as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
+    return payload
+
 
-    result = await db.execute(select(User).where(User.email == token_data.email))
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
-    return user
+async def _resolve_principal(db: AsyncSession, email: str) -> Principal:
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return cached
+
+    principal = await load_principal(db, email)
+    if principal is None:
+        raise _credentials_exception()
+    principal_cache.set(email, principal)
+    return principal
+
+
+async def _principal_from_claims(
+    db: AsyncSession, payload: dict[str, Any]
+) -> Principal | None:
+    """Build a principal from org-scoped claims, or None if they are absent or revoked."""
+    if "iat" not in payload or "uid" not in payload:
+        return None
+    if token_revocations.is_stale():
+        started = time.time()
+        token_revocations.merge(
+            await load_token_revocations(db, token_revocations.refresh_since()), started
+        )
+    if not token_revocations.is_trusted(payload["uid"], payload["iat"]):
+        return None
+
+    org_context = None
+    if payload.get("organization_name") is not None:
+        if payload.get("organization_id") is None:
+            # Issued before organizations had integer ids; resolve from the DB.
+            return None
+        org_context = OrgContext(
+            organization_id=payload["organization_id"],
+            organization_name=payload["organization_name"],
+            member_id=payload["member_id"],
+            position=payload["position"],
+        )
+    user = User(
+        id=payload["uid"],
+        email=payload["sub"],
+        is_superuser=bool(payload.get("is_superuser", False)),
+    )
+    return Principal(user=user, org_context=org_context)
+
+
+async def get_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Resolve the caller once per request (FastAPI caches this dependency).
+
+    Returns the lookup's connection to the pool: the request's session stays
+    open until the response is sent, and the route may not query it again
+    (tenant data can live on another shard or the read replica).
+    """
+    payload = _decode_token(token)
+    principal = await _resolve_principal(db, payload["sub"])
+    await release_connection(db)
+    return principal
+
+
+async def get_token_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Like ``get_principal`` but trusts unrevoked org-scoped claims without a lookup.
+
+    Only use on read endpoints: on workers that did not make a role change,
+    claims may lag it until the invalidation bus delivers it, or by up to
+    ``TOKEN_REVOCATION_REFRESH_SECONDS`` without the bus.
+    """
+    payload = _decode_token(token)
+    principal = await _principal_from_claims(db, payload)
+    if principal is None:
+        principal = await _resolve_principal(db, payload["sub"])
+    await release_connection(db)
+    return principal
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_principal),
+) -> User:
+    return principal.user
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
 ) -> User:
-    if not current_user.is_superuser:
+    if not principal.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Superuser access required",
         )
-    return current_user
+    return principal.user
 
 
 async def get_current_org_head(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
 ) -> OrgContext:
-    org_context = await get_org_context(db, current_user)
+    org_context = principal.require_org_context()
     if org_context.position != "head":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -63,7 +148,6 @@ async def get_current_org_head(
 
 
 async def get_current_member_with_org(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
 ) -> OrgContext:
-    return await get_org_context(db, current_user)
+    return principal.require_org_context()
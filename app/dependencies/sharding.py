@@ -0,0 +1,55 @@
+from typing import AsyncGenerator
+
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.sharding import DEFAULT_SHARD
+from app.database.session import get_db, get_read_db, release_connection, shard_sessionmaker
+from app.database.shards import get_tenant_shard
+from app.dependencies.auth import get_token_principal
+from app.dependencies.tenancy import Principal
+
+
+async def get_request_shard(
+    organization_name: str | None = Query(default=None),
+    principal: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_db),
+) -> str:
+    """Shard of the organization the request acts on.
+
+    Routes still authorize the caller themselves; an unknown or missing
+    organization resolves to the default shard and fails there as before.
+    Like ``get_principal``, returns the lookup's connection to the pool.
+    """
+    if principal.is_superuser:
+        shard = await get_tenant_shard(db, organization_name=organization_name)
+    elif principal.org_context is None:
+        shard = DEFAULT_SHARD
+    else:
+        shard = await get_tenant_shard(db, organization_id=principal.org_context.organization_id)
+    await release_connection(db)
+    return shard
+
+
+async def get_tenant_db(
+    shard: str = Depends(get_request_shard),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the shard holding the organization's projects and tasks."""
+    if shard == DEFAULT_SHARD:
+        yield db
+        return
+    async with shard_sessionmaker(shard)() as session:
+        yield session
+
+
+async def get_tenant_read_db(
+    shard: str = Depends(get_request_shard),
+    db: AsyncSession = Depends(get_read_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """``get_tenant_db`` for read-only routes: the read replica on the default shard."""
+    if shard == DEFAULT_SHARD:
+        yield db
+        return
+    async with shard_sessionmaker(shard)() as session:
+        yield session
@@ -4,28 +4,80 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import TeamMember, User
+from app.core.exceptions import bad_request, not_found
+from app.crud.organization import get_organization_by_name
+from app.database.models import Organization, TeamMember, User
 
 
 @dataclass(frozen=True)
 class OrgContext:
+    organization_id: int
     organization_name: str
     member_id: int
     position: str
 
 
-async def get_org_context(db: AsyncSession, current_user: User) -> OrgContext:
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user plus their organization membership, if any."""
+
+    user: User
+    org_context: OrgContext | None = None
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.user.is_superuser
+
+    @property
+    def cache_identity(self) -> tuple[str, int | None]:
+        """Role and member id; part of every response cache key."""
+        if self.is_superuser:
+            return ("superuser", None)
+        if self.org_context is None:
+            return ("none", None)
+        return (self.org_context.position, self.org_context.member_id)
+
+    def require_org_context(self) -> OrgContext:
+        if self.org_context is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not assigned to any organization.",
+            )
+        return self.org_context
+
+
+async def load_principal(db: AsyncSession, email: str) -> Principal | None:
+    """Resolve user and membership with a single ``users LEFT JOIN teams`` query."""
     result = await db.execute(
-        select(TeamMember).where(TeamMember.user_id == current_user.id)
+        select(User, TeamMember)
+        .outerjoin(TeamMember, TeamMember.user_id == User.id)
+        .where(User.email == email)
     )
-    team_member = result.scalar_one_or_none()
-    if team_member is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User is not assigned to any organization.",
+    row = result.one_or_none()
+    if row is None:
+        return None
+    user, team_member = row
+    # Principals outlive the request session (see principal_cache); detach them
+    # so a rollback later in this request cannot expire their attributes.
+    db.expunge(user)
+    org_context = None
+    if team_member is not None:
+        org_context = OrgContext(
+            organization_id=team_member.organization_id,
+            organization_name=team_member.organization_name,
+            member_id=team_member.member_id,
+            position=team_member.position,
         )
-    return OrgContext(
-        organization_name=team_member.organization_name,
-        member_id=team_member.member_id,
-        position=team_member.position,
-    )
+    return Principal(user=user, org_context=org_context)
+
+
+async def resolve_organization(
+    db: AsyncSession, organization_name: str | None
+) -> Organization:
+    """Look up the organization a superuser request names explicitly."""
+    if not organization_name:
+        raise bad_request("organization_name is required for superuser.")
+    organization = await get_organization_by_name(db, organization_name)
+    if organization is None:
+        raise not_found("Organization not found.")
+    return organization
@@ -1,17 +1,62 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import Depends, FastAPI
 
 from app.core.config import settings
-from app.routers import auth, projects, superuser, tasks, teams
+from app.core.hashing import password_hasher
+from app.core.invalidation import invalidation_listener
+from app.core.logging import configure_logging, shutdown_logging
+from app.core.metrics import collect_metrics
+from app.core.sharding import DEFAULT_SHARD
+from app.database.session import (
+    connect_listener,
+    dispose_shard_engines,
+    remember_write_lsn,
+    replica_engine,
+    track_route,
+)
+from app.dependencies.auth import get_current_superuser
+from app.routers import auth, exports, projects, superuser, sync, tasks, teams
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    configure_logging()
+    if settings.INVALIDATION_BUS_ENABLED:
+        invalidation_listener.start(
+            {
+                shard: partial(connect_listener, shard)
+                for shard in (DEFAULT_SHARD, *settings.DATABASE_SHARDS)
+            }
+        )
+    yield
+    await invalidation_listener.stop()
+    await dispose_shard_engines()
+    password_hasher.shutdown()
+    shutdown_logging()
 
-app = FastAPI(title=settings.APP_NAME)
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+if replica_engine is not None:
+    app.middleware("http")(remember_write_lsn)
+# Outermost, so the write-LSN lookup is attributed to its route too.
+app.middleware("http")(track_route)
 
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(superuser.router, prefix=settings.API_V1_PREFIX)
 app.include_router(teams.router, prefix=settings.API_V1_PREFIX)
 app.include_router(projects.router, prefix=settings.API_V1_PREFIX)
 app.include_router(tasks.router, prefix=settings.API_V1_PREFIX)
+app.include_router(exports.router, prefix=settings.API_V1_PREFIX)
+app.include_router(sync.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/health")
 async def health_check() -> dict:
     return {"status": "ok"}
+
+
+@app.get("/metrics", dependencies=[Depends(get_current_superuser)])
+async def metrics() -> dict:
+    return collect_metrics()
@@ -1,14 +1,18 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.logging import log_event
 from app.core.security import create_access_token
-from app.crud.user import authenticate_user, create_user, get_user_by_email
+from app.crud.team import get_team_member_by_user_id
+from app.crud.user import any_user_exists, authenticate_user, create_user, get_user_by_email
 from app.database.session import get_db
 from app.dependencies.auth import get_current_superuser
 from app.database.models import User
 from app.schemas.auth import Token, UserCreate, UserOut
-from sqlalchemy import select
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -25,7 +29,17 @@ async def login_for_access_token(
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token({"sub": user.email, "is_superuser": user.is_superuser})
+    claims = {"sub": user.email, "is_superuser": user.is_superuser}
+    if settings.JWT_ORG_CLAIMS_ENABLED:
+        member = await get_team_member_by_user_id(db, user.id)
+        claims.update(
+            uid=user.id,
+            organization_id=member.organization_id if member else None,
+            organization_name=member.organization_name if member else None,
+            member_id=member.member_id if member else None,
+            position=member.position if member else None,
+        )
+    access_token = create_access_token(claims)
     return Token(access_token=access_token)
 
 
@@ -35,11 +49,6 @@ async def signup_user(
     db: AsyncSession = Depends(get_db),
 ) -> UserOut:
     """Public signup endpoint. First user becomes superuser automatically."""
-    # #region agent log
-    import json
-    with open('/Users/shivanshmahajan/Developer/workflowz_ai/.cursor/debug.log', 'a') as f:
-        f.write(json.dumps({"sessionId":"debug-session","runId":"run1","hypothesisId":"A","location":"auth.py:32","message":"signup_user entry","data":{"password_len_chars":len(payload.password),"password_len_bytes":len(payload.password.encode('utf-8')),"email":payload.email[:10]+"..."},"timestamp":1733456789000})+'\n')
-    # #endregion
     existing = await get_user_by_email(db, payload.email)
     if existing is not None:
         raise HTTPException(
@@ -48,14 +57,14 @@ async def signup_user(
         )
     
     # Check if this is the first user (make them superuser)
-    result = await db.execute(select(User))
-    users = result.scalars().all()
-    is_first_user = len(users) == 0
+    is_first_user = not await any_user_exists(db)
     
-    # #region agent log
-    with open('/Users/shivanshmahajan/Developer/workflowz_ai/.cursor/debug.log', 'a') as f:
-        f.write(json.dumps({"sessionId":"debug-session","runId":"run1","hypothesisId":"A","location":"auth.py:50","message":"before create_user","data":{"password_len_chars":len(payload.password),"password_len_bytes":len(payload.password.encode('utf-8'))},"timestamp":1733456789001})+'\n')
-    # #endregion
+    log_event(
+        "auth.signup",
+        logging.DEBUG,
+        password_len_bytes=len(payload.password.encode("utf-8")),
+        is_first_user=is_first_user,
+    )
     user = await create_user(db, payload.email, payload.password, is_superuser=is_first_user)
     return UserOut.model_validate(user)
 
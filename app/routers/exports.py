@@ -0,0 +1,93 @@
+import csv
+import io
+from typing import AsyncIterator, Callable, Sequence
+
+from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import forbidden
+from app.core.logging import log_event
+from app.crud.export import stream_export_rows
+from app.database.session import release_connection, shard_sessionmaker
+from app.dependencies.auth import get_principal
+from app.dependencies.sharding import get_request_shard, get_tenant_db
+from app.dependencies.tenancy import Principal, resolve_organization
+from app.schemas.project import ProjectRow
+from app.schemas.task import TaskRow
+from app.schemas.team import TeamMemberRow
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+ROW_TYPES = {"projects": ProjectRow, "tasks": TaskRow, "teams": TeamMemberRow}
+ROW_ADAPTERS = {resource: TypeAdapter(row_type) for resource, row_type in ROW_TYPES.items()}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+Encoder = Callable[[Sequence[Row]], bytes]
+
+
+def _ndjson_encoder(adapter: TypeAdapter) -> Encoder:
+    def encode(rows: Sequence[Row]) -> bytes:
+        return b"".join(adapter.dump_json(row._asdict()) + b"\n" for row in rows)
+
+    return encode
+
+
+def _encode_csv(rows: Sequence[Sequence]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def _export_stream(
+    shard: str, organization_id: int, resource: str, header: bytes, encode: Encoder
+) -> AsyncIterator[bytes]:
+    # The request's session may be closed before the body is sent, so the
+    # cursor lives on a session owned by this generator.
+    rows = 0
+    if header:
+        yield header
+    async with shard_sessionmaker(shard)() as db:
+        async for batch in stream_export_rows(
+            db, organization_id, resource, batch_size=settings.EXPORT_BATCH_SIZE
+        ):
+            rows += len(batch)
+            yield encode(batch)
+    log_event(
+        "export.completed", organization_id=organization_id, resource=resource, rows=rows
+    )
+
+
+@router.get("/{resource}")
+async def export_resource(
+    resource: str = Path(pattern="^(projects|tasks|teams)$"),
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    organization_name: str | None = Query(default=None),
+    principal: Principal = Depends(get_principal),
+    shard: str = Depends(get_request_shard),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> StreamingResponse:
+    """Stream every ``resource`` row of the organization as NDJSON or CSV."""
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
+    else:
+        org_context = principal.require_org_context()
+        if org_context.position != "head":
+            raise forbidden("Organization head access required.")
+        org_id = org_context.organization_id
+
+    # The rows are streamed from a session of their own.
+    await release_connection(db)
+    if format == "csv":
+        header, encode = _encode_csv([list(ROW_TYPES[resource].__annotations__)]), _encode_csv
+    else:
+        header, encode = b"", _ndjson_encoder(ROW_ADAPTERS[resource])
+    return StreamingResponse(
+        _export_stream(shard, org_id, resource, header, encode),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'},
+    )
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.etag import conditional_response, weak_etag
 from app.core.exceptions import bad_request, forbidden, not_found
-from app.crud.project import create_project, delete_project, get_project, get_projects, update_project
-from app.database.session import get_db
-from app.dependencies.auth import get_current_user
-from app.dependencies.tenancy import get_org_context
-from app.schemas.project import ProjectCreate, ProjectOut, ProjectUpdate
+from app.core.pagination import decode_cursor, page_response, page_size
+from app.core.response_cache import projects_scope, response_cache
+from app.crud.organization import get_data_version
+from app.crud.project import create_project, delete_project, get_projects_page, update_project
+from app.dependencies.auth import get_principal, get_token_principal
+from app.database.session import release_connection
+from app.dependencies.sharding import get_tenant_db, get_tenant_read_db
+from app.dependencies.tenancy import Principal, resolve_organization
+from app.schemas.project import PROJECT_ROWS, ProjectCreate, ProjectOut, ProjectUpdate
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -15,43 +21,63 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 @router.get("/", response_model=list[ProjectOut])
 async def list_projects(
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[ProjectOut]:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    limit: int | None = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    principal: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_tenant_read_db),
+) -> Response:
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
-        org_name = org_context.organization_name
+        org_context = principal.require_org_context()
+        org_id = org_context.organization_id
 
-    projects = await get_projects(db, org_name)
-    return [ProjectOut.model_validate(project) for project in projects]
+    after = decode_cursor(cursor, (int,))
+    limit = page_size(limit, cursor)
+
+    async def render() -> Response:
+        page = await get_projects_page(db, org_id, limit=limit, after=after)
+        await release_connection(db)
+        return page_response(PROJECT_ROWS, page)
+
+    scope = projects_scope(org_id)
+    params = (*principal.cache_identity, limit, cursor, await get_data_version(db, org_id))
+    response = await conditional_response(
+        weak_etag(scope, params),
+        if_none_match,
+        lambda: response_cache.get_or_render(org_id, scope, params, render),
+    )
+    await release_connection(db)
+    return response
 
 
 @router.post("/", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
 async def create_new_project(
     payload: ProjectCreate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> ProjectOut:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
-        created_by = current_user.email
+    if principal.is_superuser:
+        organization = await resolve_organization(db, organization_name)
+        org_id, org_name = organization.id, organization.name
+        created_by = principal.user.email
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
-        created_by = current_user.email
+        org_id, org_name = org_context.organization_id, org_context.organization_name
+        created_by = principal.user.email
 
     try:
         project = await create_project(
-            db, org_name, payload.project_name, payload.project_description, created_by
+            db,
+            org_id,
+            org_name,
+            payload.project_name,
+            payload.project_description,
+            created_by,
         )
     except IntegrityError:
         await db.rollback()
@@ -64,23 +90,22 @@ async def update_project_by_id(
     project_id: int,
     payload: ProjectUpdate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> ProjectOut:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id = org_context.organization_id
 
-    project = await get_project(db, org_name, project_id)
-    if project is None:
+    updated = await update_project(
+        db, org_id, project_id, payload.model_dump(exclude_unset=True)
+    )
+    if updated is None:
         raise not_found("Project not found.")
-    updated = await update_project(db, project, payload.model_dump(exclude_unset=True))
     return ProjectOut.model_validate(updated)
 
 
@@ -88,20 +113,16 @@ async def update_project_by_id(
 async def delete_project_by_id(
     project_id: int,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> None:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id = org_context.organization_id
 
-    project = await get_project(db, org_name, project_id)
-    if project is None:
+    if not await delete_project(db, org_id, project_id):
         raise not_found("Project not found.")
-    await delete_project(db, project)
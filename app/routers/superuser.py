@@ -1,17 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, update
+import csv
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_organization_principals, invalidate_user_principals
+from app.core.config import settings
 from app.core.exceptions import bad_request, not_found
+from app.core.hashing import password_hasher
+from app.core.invalidation import publish_invalidation
+from app.core.logging import log_event
+from app.core.response_cache import invalidate_organization, invalidate_teams
+from app.core.pagination import decode_cursor, page_size, set_next_cursor
+from app.core.revocation import token_revocations
+from app.core.sharding import DEFAULT_SHARD, place_new_organization, shard_directory
+from app.crud.organization import (
+    ORGANIZATION_SORT_KEYS,
+    bump_data_version,
+    create_organization as insert_organization,
+    get_organization_by_name,
+    get_organization_summaries_page,
+    rename_organization,
+)
 from app.crud.team import (
     create_team_member,
-    get_all_organizations,
+    create_team_members,
+    get_member_user_ids,
+    get_organization_head,
     get_team_member_by_email,
-    get_team_members,
 )
-from app.crud.user import get_user_by_email
-from app.database.models import Project, Task, TeamMember, User
-from app.database.session import get_db
+from app.crud.user import (
+    create_users,
+    get_user_by_email,
+    get_user_ids_by_email,
+    revoke_organization_tokens,
+    revoke_tokens,
+)
+from app.database.models import User
+from app.database.session import (
+    get_db,
+    get_read_db,
+    release_connection,
+    shard_sessionmaker,
+    violated_constraint,
+)
+from app.database.shards import get_tenant_shard, mirror_committed_membership
 from app.dependencies.auth import get_current_superuser
 from app.schemas.organization import (
     OrganizationCreate,
@@ -19,31 +54,43 @@ from app.schemas.organization import (
     OrganizationOut,
     OrganizationRename,
 )
-from app.schemas.team import TeamMemberOut
+from app.schemas.team import (
+    TeamMemberImportError,
+    TeamMemberImportOut,
+    TeamMemberImportRow,
+    TeamMemberOut,
+)
 
 router = APIRouter(prefix="/superuser/organizations", tags=["superuser"])
 
 
 @router.get("/", response_model=list[OrganizationOut])
 async def list_organizations(
+    response: Response,
+    sort: str = Query(default="name", pattern="^(name|member_count)$"),
+    limit: int | None = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
     _: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[OrganizationOut]:
-    """List all organizations with their head info and member count."""
-    org_names = await get_all_organizations(db)
-    organizations = []
-    for org_name in org_names:
-        members = await get_team_members(db, org_name)
-        head = next((m for m in members if m.position == "head"), None)
-        organizations.append(
-            OrganizationOut(
-                organization_name=org_name,
-                head_name=head.name if head else None,
-                head_email=head.email if head else None,
-                member_count=len(members),
-            )
+    """List organizations with their head info and member count."""
+    page = await get_organization_summaries_page(
+        db,
+        limit=page_size(limit, cursor),
+        after=decode_cursor(cursor, ORGANIZATION_SORT_KEYS[sort]),
+        sort=sort,
+    )
+    await release_connection(db)
+    set_next_cursor(response, page.next_key)
+    return [
+        OrganizationOut(
+            organization_name=row.organization_name,
+            head_name=row.head_name,
+            head_email=row.head_email,
+            member_count=row.member_count,
         )
-    return organizations
+        for row in page.items
+    ]
 
 
 @router.post("/", response_model=TeamMemberOut)
@@ -55,8 +102,7 @@ async def create_organization(
     if payload.organization_name.strip() == "":
         raise bad_request("Organization name cannot be empty.")
 
-    existing_org = await get_team_members(db, payload.organization_name)
-    if existing_org:
+    if await get_organization_by_name(db, payload.organization_name) is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Organization already exists.",
@@ -66,15 +112,38 @@ async def create_organization(
     if head_user is None:
         raise not_found("Head user does not exist.")
 
-    member = await create_team_member(
-        db=db,
-        organization_name=payload.organization_name,
-        name=payload.head_name,
-        email=payload.head_email,
-        designation=payload.head_designation,
-        position="head",
-        user_id=head_user.id,
+    shard = place_new_organization(payload.organization_name)
+    if shard != DEFAULT_SHARD:
+        shard_sessionmaker(shard)  # fail before writing if the shard is not configured
+    organization = await insert_organization(
+        db, payload.organization_name, None if shard == DEFAULT_SHARD else shard
     )
+    if shard != DEFAULT_SHARD:
+        await publish_invalidation(db, organization.id, "shards")
+    try:
+        member = await create_team_member(
+            db=db,
+            organization_id=organization.id,
+            organization_name=organization.name,
+            name=payload.head_name,
+            email=payload.head_email,
+            designation=payload.head_designation,
+            position="head",
+            user_id=head_user.id,
+        )
+    except IntegrityError as exc:
+        # The organization row goes with it.
+        await db.rollback()
+        # The organization is new, so only the head's other membership conflicts.
+        if violated_constraint(exc) != "teams_user_id_unique":
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Head user already belongs to an organization.",
+        )
+    if shard != DEFAULT_SHARD:
+        shard_directory.expire()
+        await mirror_committed_membership(organization.id, organization.name, shard)
     return TeamMemberOut.model_validate(member)
 
 
@@ -88,33 +157,32 @@ async def update_organization_name(
     if payload.new_name.strip() == "":
         raise bad_request("New organization name cannot be empty.")
 
-    existing_org = await get_team_members(db, organization_name)
-    if not existing_org:
+    organization = await get_organization_by_name(db, organization_name)
+    if organization is None:
         raise not_found("Organization not found.")
 
-    existing_new = await get_team_members(db, payload.new_name)
-    if existing_new:
+    if await get_organization_by_name(db, payload.new_name) is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="New organization name already exists.",
         )
 
-    await db.execute(
-        update(TeamMember)
-        .where(TeamMember.organization_name == organization_name)
-        .values(organization_name=payload.new_name)
-    )
-    await db.execute(
-        update(Project)
-        .where(Project.organization_name == organization_name)
-        .values(organization_name=payload.new_name)
-    )
-    await db.execute(
-        update(Task)
-        .where(Task.organization_name == organization_name)
-        .values(organization_name=payload.new_name)
-    )
+    # Tenant rows reference organizations.id, so this is a single-row update;
+    # only the org claims in members' tokens still need revoking.
+    revoked = await revoke_organization_tokens(db, organization.id)
+    await rename_organization(db, organization.id, payload.new_name)
+    # Superuser requests find their shard by organization name.
+    await publish_invalidation(db, organization.id, "organization", "principals", "shards")
     await db.commit()
+    token_revocations.revoke(revoked)
+    invalidate_organization_principals(organization.id)
+    await invalidate_organization(organization.id)
+    shard_directory.expire()
+    await mirror_committed_membership(
+        organization.id,
+        payload.new_name,
+        await get_tenant_shard(db, organization_id=organization.id),
+    )
     return {"status": "updated", "organization_name": payload.new_name}
 
 
@@ -125,8 +193,8 @@ async def change_organization_head(
     _: User = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> TeamMemberOut:
-    existing_org = await get_team_members(db, organization_name)
-    if not existing_org:
+    organization = await get_organization_by_name(db, organization_name)
+    if organization is None:
         raise not_found("Organization not found.")
 
     new_head_user = await get_user_by_email(db, payload.new_head_email)
@@ -134,23 +202,197 @@ async def change_organization_head(
         raise not_found("User for new head does not exist.")
 
     new_head_member = await get_team_member_by_email(
-        db, organization_name, payload.new_head_email
+        db, organization.id, payload.new_head_email
     )
     if new_head_member is None:
         raise not_found("New head must be an existing team member.")
 
-    result = await db.execute(
-        select(TeamMember).where(
-            TeamMember.organization_name == organization_name,
-            TeamMember.position == "head",
-        )
-    )
-    current_head = result.scalar_one_or_none()
+    current_head = await get_organization_head(db, organization.id)
     if current_head is None:
         raise not_found("Current organization head not found.")
 
+    version = await bump_data_version(db, organization.id)
+    # Demote first: teams_one_head_per_org is checked row by row.
     current_head.position = "member"
+    current_head.change_version = version
+    await db.flush()
     new_head_member.position = "head"
+    new_head_member.change_version = version
+    revoked = await revoke_tokens(db, [current_head.user_id, new_head_member.user_id])
+    await publish_invalidation(
+        db,
+        organization.id,
+        "teams",
+        f"user:{current_head.user_id}",
+        f"user:{new_head_member.user_id}",
+    )
     await db.commit()
-    await db.refresh(new_head_member)
+    token_revocations.revoke(revoked)
+    invalidate_user_principals({current_head.user_id, new_head_member.user_id})
+    await invalidate_teams(organization.id)
+    await mirror_committed_membership(
+        organization.id,
+        organization.name,
+        await get_tenant_shard(db, organization_id=organization.id),
+    )
     return TeamMemberOut.model_validate(new_head_member)
+
+
+IMPORT_COLUMNS = tuple(TeamMemberImportRow.model_fields)
+
+
+def _parse_member_csv(
+    content: bytes,
+) -> tuple[list[tuple[int, TeamMemberImportRow]], list[TeamMemberImportError]]:
+    """Validate every CSV row; returns (row number, row) pairs and per-row errors."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise bad_request("CSV must be UTF-8 encoded.") from exc
+    reader = csv.DictReader(io.StringIO(text))
+    if not {"email", "name"} <= set(reader.fieldnames or ()):
+        raise bad_request("CSV must have 'email' and 'name' columns.")
+
+    rows: list[tuple[int, TeamMemberImportRow]] = []
+    errors: list[TeamMemberImportError] = []
+    seen: set[str] = set()
+    for line, record in enumerate(reader, start=2):
+        email = (record.get("email") or "").strip() or None
+        values = {
+            column: value
+            for column in IMPORT_COLUMNS
+            if (value := (record.get(column) or "").strip())
+        }
+        try:
+            row = TeamMemberImportRow.model_validate(values)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            errors.append(
+                TeamMemberImportError(row=line, email=email, detail=f"{field}: {error['msg']}")
+            )
+            continue
+        if row.email in seen:
+            errors.append(
+                TeamMemberImportError(row=line, email=row.email, detail="Duplicate email in file.")
+            )
+            continue
+        seen.add(row.email)
+        rows.append((line, row))
+    return rows, errors
+
+
+@router.post("/{organization_name}/members:import", response_model=TeamMemberImportOut)
+async def import_team_members(
+    organization_name: str,
+    file: UploadFile = File(..., description="CSV with email, name, designation, password"),
+    _: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> TeamMemberImportOut:
+    """Create missing users and add everyone as members in one transaction.
+
+    Rows that fail validation or conflict are reported in ``errors``; the
+    remaining rows are still imported.
+    """
+    organization = await get_organization_by_name(db, organization_name)
+    if organization is None:
+        raise not_found("Organization not found.")
+
+    rows, errors = _parse_member_csv(await file.read())
+    if len(rows) + len(errors) > settings.MAX_IMPORT_MEMBERS:
+        raise bad_request(f"At most {settings.MAX_IMPORT_MEMBERS} rows per import.")
+
+    existing_users = await get_user_ids_by_email(db, [row.email for _, row in rows])
+    already_members = await get_member_user_ids(db, set(existing_users.values()))
+    pending: list[tuple[int, TeamMemberImportRow]] = []
+    for line, row in rows:
+        user_id = existing_users.get(row.email)
+        if user_id is not None and user_id in already_members:
+            detail = "User is already a team member."
+        elif user_id is None and row.password is None:
+            detail = "password is required for new users."
+        else:
+            pending.append((line, row))
+            continue
+        errors.append(TeamMemberImportError(row=line, email=row.email, detail=detail))
+
+    # Nothing is written yet: end the read transaction so no connection sits
+    # idle in transaction while bcrypt runs.
+    await release_connection(db)
+    new_users = [(line, row) for line, row in pending if row.email not in existing_users]
+    hashed_passwords = await password_hasher.hash_many([row.password for _, row in new_users])
+    hashed_users: list[dict] = []
+    unhashed: set[str] = set()
+    for (line, row), hashed_password in zip(new_users, hashed_passwords):
+        if isinstance(hashed_password, HTTPException):
+            detail = "Password hashing is busy; retry this row."
+        elif isinstance(hashed_password, ValueError):
+            detail = f"password: {hashed_password}"
+        else:
+            hashed_users.append({"email": row.email, "hashed_password": hashed_password})
+            continue
+        unhashed.add(row.email)
+        errors.append(TeamMemberImportError(row=line, email=row.email, detail=detail))
+    pending = [(line, row) for line, row in pending if row.email not in unhashed]
+
+    created_users = await create_users(db, hashed_users)
+    user_ids = existing_users | created_users
+
+    added_members, revoked = await create_team_members(
+        db,
+        organization.id,
+        [
+            {
+                "name": row.name,
+                "email": row.email,
+                "designation": row.designation,
+                "user_id": user_ids[row.email],
+            }
+            for _, row in pending
+            if row.email in user_ids
+        ],
+    )
+    await db.commit()
+    token_revocations.revoke(revoked)
+    invalidate_user_principals(set(added_members.values()))
+    await invalidate_teams(organization.id)
+    # Rows skipped by a conflict: the email is taken in this organization, or
+    # the user joined an organization since the check above.
+    now_members = await get_member_user_ids(
+        db,
+        {
+            user_ids[row.email]
+            for _, row in pending
+            if row.email in user_ids and row.email not in added_members
+        },
+    )
+    await mirror_committed_membership(
+        organization.id,
+        organization.name,
+        await get_tenant_shard(db, organization_id=organization.id),
+    )
+
+    for line, row in pending:
+        if row.email not in user_ids:
+            detail = "User was created concurrently; retry this row."
+        elif row.email in added_members:
+            continue
+        elif user_ids[row.email] in now_members:
+            detail = "User is already a team member."
+        else:
+            detail = "Email is already used in this organization."
+        errors.append(TeamMemberImportError(row=line, email=row.email, detail=detail))
+
+    log_event(
+        "team.imported",
+        organization_id=organization.id,
+        users_created=len(created_users),
+        members_added=len(added_members),
+        errors=len(errors),
+    )
+    return TeamMemberImportOut(
+        organization_name=organization.name,
+        users_created=len(created_users),
+        members_added=len(added_members),
+        errors=sorted(errors, key=lambda error: error.row),
+    )
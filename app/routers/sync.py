@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import bad_request, forbidden
+from app.core.pagination import encode_cursor, load_cursor
+from app.crud.organization import get_data_version
+from app.crud.sync import SYNC_KEY_LENGTHS, SYNC_RESOURCES, get_changes_page
+from app.dependencies.auth import get_principal
+from app.database.session import release_connection
+from app.dependencies.sharding import get_tenant_db
+from app.dependencies.tenancy import Principal, resolve_organization
+from app.schemas.sync import SYNC_PAGE, SyncPage
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@dataclass
+class SyncPosition:
+    """Where a sync cycle stands, as carried by its cursor.
+
+    A finished cycle is encoded as ``[version]``: the client holds every
+    change up to that organization data version. Within a cycle the cursor is
+    ``[since, until, resource index, *last key]``; ``until`` is the data
+    version read when the cycle started, so rows written meanwhile wait for
+    the next cycle instead of shifting the pages.
+    """
+
+    since: int
+    until: int | None = None
+    resource: int = 0
+    after: list[int] | None = None
+
+    @classmethod
+    def decode(cls, cursor: str | None) -> "SyncPosition":
+        if cursor is None:
+            # Every stamped row has change_version >= 0.
+            return cls(since=-1)
+        raw = load_cursor(cursor)
+        if not isinstance(raw, list) or not all(type(value) is int for value in raw):
+            raise bad_request("Invalid cursor.")
+        if len(raw) == 1:
+            return cls(since=raw[0])
+        if len(raw) < 3 or not 0 <= raw[2] < len(SYNC_RESOURCES):
+            raise bad_request("Invalid cursor.")
+        since, until, resource, *after = raw
+        if after and len(after) != SYNC_KEY_LENGTHS[SYNC_RESOURCES[resource]]:
+            raise bad_request("Invalid cursor.")
+        return cls(since, until, resource, after or None)
+
+    def encode(self) -> str:
+        if self.resource == len(SYNC_RESOURCES):
+            return encode_cursor([self.until])
+        return encode_cursor([self.since, self.until, self.resource, *(self.after or [])])
+
+
+@router.get("/", response_model=SyncPage)
+async def sync_changes(
+    since: str | None = Query(
+        default=None, description="Cursor from the previous sync; omit for a full sync."
+    ),
+    limit: int = Query(default=settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    organization_name: str | None = Query(default=None),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> Response:
+    """Projects, tasks and members changed since the cursor, plus deletions.
+
+    Repeat with the returned ``cursor`` while ``has_more`` is true; after
+    that, keep the cursor for the next incremental pull. Members can only see
+    their own tasks, so the endpoint is for heads and superusers.
+    """
+    if principal.is_superuser:
+        organization = await resolve_organization(db, organization_name)
+        org_id, org_name = organization.id, organization.name
+    else:
+        org_context = principal.require_org_context()
+        if org_context.position != "head":
+            raise forbidden("Organization head access required.")
+        org_id, org_name = org_context.organization_id, org_context.organization_name
+
+    position = SyncPosition.decode(since)
+    if position.until is None:
+        position.until = await get_data_version(db, org_id)
+
+    changes: dict[str, list] = {resource: [] for resource in SYNC_RESOURCES}
+    remaining = limit
+    while remaining and position.resource < len(SYNC_RESOURCES):
+        resource = SYNC_RESOURCES[position.resource]
+        page = await get_changes_page(
+            db,
+            org_id,
+            resource,
+            since=position.since,
+            until=position.until,
+            limit=remaining,
+            after=position.after,
+        )
+        changes[resource] = [row._asdict() for row in page.items]
+        remaining -= len(page.items)
+        if page.next_key is not None:
+            position.after = page.next_key
+            break
+        position.resource += 1
+        position.after = None
+    await release_connection(db)
+
+    return Response(
+        SYNC_PAGE.dump_json(
+            {
+                "organization_name": org_name,
+                "cursor": position.encode(),
+                "has_more": position.resource < len(SYNC_RESOURCES),
+                **changes,
+            }
+        ),
+        media_type="application/json",
+    )
@@ -1,13 +1,41 @@
-from fastapi import APIRouter, Depends, Query, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.etag import conditional_response, weak_etag
 from app.core.exceptions import bad_request, forbidden, not_found
-from app.crud.project import recalculate_project_progress
-from app.crud.task import create_task, delete_task, get_task, get_tasks, update_task
-from app.database.session import get_db
-from app.dependencies.auth import get_current_user
-from app.dependencies.tenancy import get_org_context
-from app.schemas.task import TaskCompleteUpdate, TaskCreate, TaskOut, TaskUpdate
+from app.core.pagination import decode_cursor, page_response, page_size
+from app.core.response_cache import response_cache, tasks_scope
+from app.crud.organization import get_data_version
+from app.crud.project import get_project
+from app.crud.task import (
+    TASK_SORT_KEYS,
+    create_task,
+    create_tasks,
+    delete_task,
+    get_task,
+    get_tasks_page,
+    update_task,
+    update_tasks,
+)
+from app.crud.team import get_existing_member_ids
+from app.dependencies.auth import get_principal, get_token_principal
+from app.database.session import release_connection
+from app.dependencies.sharding import get_tenant_db, get_tenant_read_db
+from app.dependencies.tenancy import Principal, resolve_organization
+from app.schemas.task import (
+    TASK_ROWS,
+    TaskBulkCreate,
+    TaskBulkCreateOut,
+    TaskBulkUpdate,
+    TaskBulkUpdateOut,
+    TaskCompleteUpdate,
+    TaskCreate,
+    TaskOut,
+    TaskUpdate,
+)
 
 router = APIRouter(prefix="/projects/{project_id}/tasks", tags=["tasks"])
 
@@ -16,22 +44,66 @@ router = APIRouter(prefix="/projects/{project_id}/tasks", tags=["tasks"])
 async def list_tasks(
     project_id: int,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[TaskOut]:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
-        tasks = await get_tasks(db, org_name, project_id)
+    assigned_to: int | None = Query(default=None),
+    completed: bool | None = Query(default=None),
+    importance: str | None = Query(default=None, pattern="^(high|medium|low)$"),
+    deadline_from: date | None = Query(default=None),
+    deadline_to: date | None = Query(default=None),
+    sort: str = Query(default="task_id", pattern="^(task_id|deadline|importance)$"),
+    limit: int | None = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    principal: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_tenant_read_db),
+) -> Response:
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
-        org_name = org_context.organization_name
-        tasks = await get_tasks(db, org_name, project_id)
+        org_context = principal.require_org_context()
+        org_id = org_context.organization_id
         if org_context.position == "member":
-            tasks = [task for task in tasks if task.task_assigned_to == org_context.member_id]
+            assigned_to = org_context.member_id
+
+    after = decode_cursor(cursor, TASK_SORT_KEYS[sort])
+    limit = page_size(limit, cursor)
+
+    async def render() -> Response:
+        page = await get_tasks_page(
+            db,
+            org_id,
+            project_id,
+            limit=limit,
+            after=after,
+            sort=sort,
+            assigned_to=assigned_to,
+            completed=completed,
+            importance=importance,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+        )
+        await release_connection(db)
+        return page_response(TASK_ROWS, page)
 
-    return [TaskOut.model_validate(task) for task in tasks]
+    scope = tasks_scope(org_id, project_id)
+    params = (
+        *principal.cache_identity,
+        assigned_to,
+        completed,
+        importance,
+        deadline_from,
+        deadline_to,
+        sort,
+        limit,
+        cursor,
+        await get_data_version(db, org_id),
+    )
+    response = await conditional_response(
+        weak_etag(scope, params),
+        if_none_match,
+        lambda: response_cache.get_or_render(org_id, scope, params, render),
+    )
+    await release_connection(db)
+    return response
 
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
@@ -39,21 +111,21 @@ async def create_new_task(
     project_id: int,
     payload: TaskCreate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> TaskOut:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        organization = await resolve_organization(db, organization_name)
+        org_id, org_name = organization.id, organization.name
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id, org_name = org_context.organization_id, org_context.organization_name
 
     task = await create_task(
         db=db,
+        organization_id=org_id,
         organization_name=org_name,
         project_id=project_id,
         task_description=payload.task_description,
@@ -61,34 +133,111 @@ async def create_new_task(
         task_assigned_to=payload.task_assigned_to,
         task_importance=payload.task_importance,
     )
-    await recalculate_project_progress(db, org_name, project_id)
     return TaskOut.model_validate(task)
 
 
+@router.post(
+    ":bulk", response_model=TaskBulkCreateOut, status_code=status.HTTP_201_CREATED
+)
+async def create_tasks_bulk(
+    project_id: int,
+    payload: TaskBulkCreate,
+    organization_name: str | None = Query(default=None),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> TaskBulkCreateOut:
+    """Create many tasks (e.g. an AI-generated plan) in one transaction."""
+    if len(payload.tasks) > settings.MAX_BULK_TASKS:
+        raise bad_request(f"At most {settings.MAX_BULK_TASKS} tasks per request.")
+
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
+    else:
+        org_context = principal.require_org_context()
+        if org_context.position != "head":
+            raise forbidden("Organization head access required.")
+        org_id = org_context.organization_id
+
+    if await get_project(db, org_id, project_id) is None:
+        raise not_found("Project not found.")
+
+    assignees = {task.task_assigned_to for task in payload.tasks}
+    unknown = assignees - await get_existing_member_ids(db, org_id, assignees)
+    if unknown:
+        raise bad_request(
+            f"Unknown assignees: {', '.join(str(member_id) for member_id in sorted(unknown))}."
+        )
+
+    task_ids = await create_tasks(
+        db, org_id, project_id, [task.model_dump() for task in payload.tasks]
+    )
+    return TaskBulkCreateOut(project_id=project_id, task_ids=task_ids)
+
+
+@router.patch(":bulk", response_model=TaskBulkUpdateOut)
+async def update_tasks_bulk(
+    project_id: int,
+    payload: TaskBulkUpdate,
+    organization_name: str | None = Query(default=None),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> TaskBulkUpdateOut:
+    """Complete, reassign or re-prioritise many tasks with one set-based UPDATE."""
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise bad_request("No changes given.")
+    if changes.get("task_completed", False) is None or changes.get("task_assigned_to", 0) is None:
+        raise bad_request("task_completed and task_assigned_to cannot be null.")
+    if payload.task_ids is None and payload.filter is None:
+        raise bad_request("Provide task_ids or filter.")
+    if payload.task_ids is not None and len(payload.task_ids) > settings.MAX_BULK_TASKS:
+        raise bad_request(f"At most {settings.MAX_BULK_TASKS} tasks per request.")
+
+    filters = payload.filter.model_dump() if payload.filter else {}
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
+    else:
+        org_context = principal.require_org_context()
+        org_id = org_context.organization_id
+        if org_context.position == "member":
+            if set(changes) != {"task_completed"}:
+                raise forbidden("Members can only change completion of their assigned tasks.")
+            filters["assigned_to"] = org_context.member_id
+
+    new_assignee = changes.get("task_assigned_to")
+    if new_assignee is not None and not await get_existing_member_ids(
+        db, org_id, {new_assignee}
+    ):
+        raise bad_request(f"Unknown assignees: {new_assignee}.")
+
+    task_ids = await update_tasks(
+        db, org_id, project_id, changes, task_ids=payload.task_ids, **filters
+    )
+    return TaskBulkUpdateOut(project_id=project_id, task_ids=task_ids)
+
+
 @router.patch("/{task_id}", response_model=TaskOut)
 async def update_task_by_id(
     project_id: int,
     task_id: int,
     payload: TaskUpdate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> TaskOut:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id = org_context.organization_id
 
-    task = await get_task(db, org_name, project_id, task_id)
-    if task is None:
+    updated = await update_task(
+        db, org_id, project_id, task_id, payload.model_dump(exclude_unset=True)
+    )
+    if updated is None:
         raise not_found("Task not found.")
-    updated = await update_task(db, task, payload.model_dump(exclude_unset=True))
-    await recalculate_project_progress(db, org_name, project_id)
     return TaskOut.model_validate(updated)
 
 
@@ -98,28 +247,31 @@ async def mark_task_complete(
     task_id: int,
     payload: TaskCompleteUpdate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> TaskOut:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
-        org_context = None
+    assigned_to = None
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
-        org_name = org_context.organization_name
-
-    task = await get_task(db, org_name, project_id, task_id)
-    if task is None:
-        raise not_found("Task not found.")
+        org_context = principal.require_org_context()
+        org_id = org_context.organization_id
+        if org_context.position == "member":
+            assigned_to = org_context.member_id
 
-    if not current_user.is_superuser:
-        if org_context.position == "member" and task.task_assigned_to != org_context.member_id:
+    updated = await update_task(
+        db,
+        org_id,
+        project_id,
+        task_id,
+        {"task_completed": payload.task_completed},
+        assigned_to=assigned_to,
+    )
+    if updated is None:
+        # Only look the task up again to tell "missing" from "not yours".
+        if assigned_to is not None and await get_task(db, org_id, project_id, task_id) is not None:
             raise forbidden("You can only update your assigned tasks.")
-
-    updated = await update_task(db, task, {"task_completed": payload.task_completed})
-    await recalculate_project_progress(db, org_name, project_id)
+        raise not_found("Task not found.")
     return TaskOut.model_validate(updated)
 
 
@@ -128,21 +280,16 @@ async def delete_task_by_id(
     project_id: int,
     task_id: int,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_tenant_db),
 ) -> None:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id = org_context.organization_id
 
-    task = await get_task(db, org_name, project_id, task_id)
-    if task is None:
+    if not await delete_task(db, org_id, project_id, task_id):
         raise not_found("Task not found.")
-    await delete_task(db, task)
-    await recalculate_project_progress(db, org_name, project_id)
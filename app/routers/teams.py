@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.etag import conditional_response, weak_etag
 from app.core.exceptions import bad_request, forbidden, not_found
-from app.crud.team import create_team_member, get_team_members
+from app.core.pagination import decode_cursor, page_response, page_size
+from app.core.response_cache import response_cache, teams_scope
+from app.crud.organization import get_data_version, get_organization_id
+from app.crud.team import (
+    MEMBER_CONFLICTS,
+    create_team_member,
+    get_team_members,
+    get_team_members_page,
+)
 from app.crud.user import get_user_by_email
-from app.database.session import get_db
-from app.dependencies.auth import get_current_user
-from app.dependencies.tenancy import get_org_context
-from app.schemas.team import TeamMemberCreate, TeamMemberOut
+from app.database.session import get_db, get_read_db, release_connection, violated_constraint
+from app.database.shards import get_tenant_shard, mirror_committed_membership
+from app.dependencies.auth import get_principal
+from app.dependencies.tenancy import Principal, resolve_organization
+from app.schemas.team import TEAM_MEMBER_ROWS, TeamMemberCreate, TeamMemberOut
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
@@ -29,7 +41,11 @@ async def get_team_for_agents(
         return [TeamMemberOut.model_validate(m) for m in mock_data]
     
     try:
-        members = await get_team_members(db, organization_name)
+        organization_id = await get_organization_id(db, organization_name)
+        if organization_id is None:
+            return []
+        members = await get_team_members(db, organization_id)
+        await release_connection(db)
         return [TeamMemberOut.model_validate(member) for member in members]
     except Exception as e:
         # Fallback to mock data if database query fails
@@ -43,54 +59,80 @@ async def get_team_for_agents(
 @router.get("/", response_model=list[TeamMemberOut])
 async def list_team_members(
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[TeamMemberOut]:
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    limit: int | None = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    if principal.is_superuser:
+        org_id = (await resolve_organization(db, organization_name)).id
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id = org_context.organization_id
+
+    after = decode_cursor(cursor, (int,))
+    limit = page_size(limit, cursor)
 
-    members = await get_team_members(db, org_name)
-    return [TeamMemberOut.model_validate(member) for member in members]
+    async def render() -> Response:
+        page = await get_team_members_page(db, org_id, limit=limit, after=after)
+        await release_connection(db)
+        return page_response(TEAM_MEMBER_ROWS, page)
+
+    scope = teams_scope(org_id)
+    params = (*principal.cache_identity, limit, cursor, await get_data_version(db, org_id))
+    response = await conditional_response(
+        weak_etag(scope, params),
+        if_none_match,
+        lambda: response_cache.get_or_render(org_id, scope, params, render),
+    )
+    await release_connection(db)
+    return response
 
 
 @router.post("/", response_model=TeamMemberOut, status_code=status.HTTP_201_CREATED)
 async def add_team_member(
     payload: TeamMemberCreate,
     organization_name: str | None = Query(default=None),
-    current_user=Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
     db: AsyncSession = Depends(get_db),
 ) -> TeamMemberOut:
     if payload.position not in {"head", "member"}:
         raise bad_request("position must be 'head' or 'member'.")
 
-    if current_user.is_superuser:
-        if not organization_name:
-            raise bad_request("organization_name is required for superuser.")
-        org_name = organization_name
+    if principal.is_superuser:
+        organization = await resolve_organization(db, organization_name)
+        org_id, org_name = organization.id, organization.name
     else:
-        org_context = await get_org_context(db, current_user)
+        org_context = principal.require_org_context()
         if org_context.position != "head":
             raise forbidden("Organization head access required.")
-        org_name = org_context.organization_name
+        org_id, org_name = org_context.organization_id, org_context.organization_name
 
     user = await get_user_by_email(db, payload.email)
     if user is None:
         raise not_found("User does not exist.")
 
-    member = await create_team_member(
-        db=db,
-        organization_name=org_name,
-        name=payload.name,
-        email=payload.email,
-        designation=payload.designation,
-        position=payload.position,
-        user_id=user.id,
+    try:
+        member = await create_team_member(
+            db=db,
+            organization_id=org_id,
+            organization_name=org_name,
+            name=payload.name,
+            email=payload.email,
+            designation=payload.designation,
+            position=payload.position,
+            user_id=user.id,
+        )
+    except IntegrityError as exc:
+        await db.rollback()
+        detail = MEMBER_CONFLICTS.get(violated_constraint(exc))
+        if detail is None:
+            raise
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+    await mirror_committed_membership(
+        org_id, org_name, await get_tenant_shard(db, organization_id=org_id)
     )
     return TeamMemberOut.model_validate(member)
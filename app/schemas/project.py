@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class ProjectCreate(BaseModel):
@@ -21,3 +22,17 @@ class ProjectOut(BaseModel):
     created_by: str
 
     model_config = {"from_attributes": True}
+
+
+class ProjectRow(TypedDict):
+    """``ProjectOut`` as a plain mapping, for list reads of trusted rows."""
+
+    organization_name: str
+    project_id: int
+    project_name: str
+    project_description: str | None
+    project_progress: int
+    created_by: str
+
+
+PROJECT_ROWS = TypeAdapter(list[ProjectRow])
@@ -0,0 +1,61 @@
+from datetime import date, datetime
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+
+class ProjectSyncRow(TypedDict):
+    project_id: int
+    project_name: str
+    project_description: str | None
+    project_progress: int
+    created_by: str
+    updated_at: datetime
+
+
+class TaskSyncRow(TypedDict):
+    project_id: int
+    task_id: int
+    task_description: str
+    task_deadline: date | None
+    task_assigned_to: int
+    task_importance: str | None
+    task_completed: bool
+    updated_at: datetime
+
+
+class TeamMemberSyncRow(TypedDict):
+    member_id: int
+    name: str
+    email: str
+    designation: str | None
+    position: str
+    updated_at: datetime
+
+
+class DeletionRow(TypedDict):
+    """A deleted project (``task_id`` is None, its tasks went with it) or task."""
+
+    resource: str
+    project_id: int
+    task_id: int | None
+    deleted_at: datetime
+
+
+class SyncPage(TypedDict):
+    """One page of changes; pass ``cursor`` back as ``since`` for the next one.
+
+    Rows carry no organization name: a rename shows up in
+    ``organization_name`` here.
+    """
+
+    organization_name: str
+    cursor: str
+    has_more: bool
+    projects: list[ProjectSyncRow]
+    tasks: list[TaskSyncRow]
+    members: list[TeamMemberSyncRow]
+    deleted: list[DeletionRow]
+
+
+SYNC_PAGE = TypeAdapter(SyncPage)
@@ -1,6 +1,7 @@
 from datetime import date
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class TaskCreate(BaseModel):
@@ -12,6 +13,45 @@ class TaskCreate(BaseModel):
     )
 
 
+class TaskBulkCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(min_length=1)
+
+
+class TaskBulkCreateOut(BaseModel):
+    project_id: int
+    task_ids: list[int]
+
+
+class TaskBulkFilter(BaseModel):
+    assigned_to: int | None = None
+    completed: bool | None = None
+    importance: str | None = Field(default=None, pattern="^(high|medium|low)$")
+    deadline_from: date | None = None
+    deadline_to: date | None = None
+
+
+class TaskBulkChanges(BaseModel):
+    task_completed: bool | None = None
+    task_assigned_to: int | None = None
+    task_importance: str | None = Field(
+        default=None, pattern="^(high|medium|low)$"
+    )
+    task_deadline: date | None = None
+
+
+class TaskBulkUpdate(BaseModel):
+    """Select tasks by ``task_ids`` and/or ``filter`` and apply ``changes``."""
+
+    task_ids: list[int] | None = Field(default=None, min_length=1)
+    filter: TaskBulkFilter | None = None
+    changes: TaskBulkChanges
+
+
+class TaskBulkUpdateOut(BaseModel):
+    project_id: int
+    task_ids: list[int]
+
+
 class TaskUpdate(BaseModel):
     task_description: str | None = None
     task_deadline: date | None = None
@@ -36,3 +76,19 @@ class TaskOut(BaseModel):
     task_completed: bool
 
     model_config = {"from_attributes": True}
+
+
+class TaskRow(TypedDict):
+    """``TaskOut`` as a plain mapping, for list reads of trusted rows."""
+
+    organization_name: str
+    project_id: int
+    task_id: int
+    task_description: str
+    task_deadline: date | None
+    task_assigned_to: int
+    task_importance: str | None
+    task_completed: bool
+
+
+TASK_ROWS = TypeAdapter(list[TaskRow])
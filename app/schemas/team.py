@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class TeamMemberCreate(BaseModel):
@@ -8,6 +9,28 @@ class TeamMemberCreate(BaseModel):
     position: str = "member"
 
 
+class TeamMemberImportRow(BaseModel):
+    """One CSV row of a member import; ``password`` is only needed for new users."""
+
+    email: EmailStr
+    name: str = Field(min_length=1, max_length=100)
+    designation: str | None = Field(default=None, max_length=100)
+    password: str | None = Field(default=None, min_length=8, max_length=72)
+
+
+class TeamMemberImportError(BaseModel):
+    row: int
+    email: str | None = None
+    detail: str
+
+
+class TeamMemberImportOut(BaseModel):
+    organization_name: str
+    users_created: int
+    members_added: int
+    errors: list[TeamMemberImportError]
+
+
 class TeamMemberOut(BaseModel):
     organization_name: str
     member_id: int
@@ -17,3 +40,17 @@ class TeamMemberOut(BaseModel):
     position: str
 
     model_config = {"from_attributes": True}
+
+
+class TeamMemberRow(TypedDict):
+    """``TeamMemberOut`` as a plain mapping; stored emails are not re-validated."""
+
+    organization_name: str
+    member_id: int
+    name: str
+    email: str
+    designation: str | None
+    position: str
+
+
+TEAM_MEMBER_ROWS = TypeAdapter(list[TeamMemberRow])
@@ -0,0 +1,162 @@
+"""Fixtures for tests that run against Postgres.
+
+The suite uses the database at ``DATABASE_URL`` (migrated to head first);
+test modules skip themselves unless that is a Postgres URL (see
+``requires_postgres``). Every run signs up its own users and organization
+under a random suffix, so existing data is left alone.
+"""
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+import httpx
+from alembic import command
+from alembic.config import Config
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+ROOT = Path(__file__).resolve().parent.parent
+PASSWORD = "password123"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "slow: seeds large tables; deselect with -m 'not slow'"
+    )
+
+
+def requires_postgres() -> None:
+    """Skip the calling test module unless ``DATABASE_URL`` is a Postgres database.
+
+    Call it before importing ``app``: settings cannot load without the URL.
+    """
+    if not os.environ.get("DATABASE_URL", "").startswith("postgresql"):
+        pytest.skip("DATABASE_URL is not a Postgres database", allow_module_level=True)
+
+
+@dataclass
+class Tenant:
+    """An organization seeded through the API, with a token per role."""
+
+    organization_name: str
+    organization_id: int
+    superuser_email: str
+    head_email: str
+    member_email: str
+    project_id: int
+    head_member_id: int
+    member_id: int
+    superuser: dict[str, str]
+    head: dict[str, str]
+    member: dict[str, str]
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def migrated_database() -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+async def client(migrated_database):
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+async def login(client: httpx.AsyncClient, email: str) -> dict[str, str]:
+    response = await client.post(
+        "/api/auth/token", data={"username": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+async def tenant(client) -> Tenant:
+    from app.crud.organization import get_organization_id
+    from app.crud.user import create_user
+    from app.database.session import AsyncSessionLocal
+
+    suffix = uuid.uuid4().hex[:8]
+    superuser_email = f"su-{suffix}@example.com"
+    head_email = f"head-{suffix}@example.com"
+    member_email = f"member-{suffix}@example.com"
+    organization_name = f"Test {suffix}"
+
+    # Signup only makes the very first user a superuser.
+    async with AsyncSessionLocal() as db:
+        await create_user(db, superuser_email, PASSWORD, is_superuser=True)
+    for email in (head_email, member_email):
+        response = await client.post(
+            "/api/auth/signup", json={"email": email, "password": PASSWORD}
+        )
+        assert response.status_code == 200, response.text
+
+    superuser = await login(client, superuser_email)
+    response = await client.post(
+        "/api/superuser/organizations/",
+        headers=superuser,
+        json={
+            "organization_name": organization_name,
+            "head_email": head_email,
+            "head_name": "Head",
+        },
+    )
+    assert response.status_code == 200, response.text
+    head = await login(client, head_email)
+
+    response = await client.post(
+        "/api/teams/", headers=head, json={"name": "Member", "email": member_email}
+    )
+    assert response.status_code == 201, response.text
+    member_id = response.json()["member_id"]
+    team = (await client.get("/api/teams/", headers=head)).json()
+    head_member_id = next(row["member_id"] for row in team if row["email"] == head_email)
+
+    response = await client.post(
+        "/api/projects/", headers=head, json={"project_name": "Seeded"}
+    )
+    assert response.status_code == 201, response.text
+    project = response.json()
+    for index, importance in enumerate(["high", "medium", "low", None, "high", "low"]):
+        response = await client.post(
+            f"/api/projects/{project['project_id']}/tasks/",
+            headers=head,
+            json={
+                "task_description": f"Seeded task {index}",
+                "task_deadline": f"2026-1{index % 3}-0{index + 1}",
+                "task_assigned_to": member_id if index % 2 else head_member_id,
+                "task_importance": importance,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    async with AsyncSessionLocal() as db:
+        organization_id = await get_organization_id(db, organization_name)
+
+    return Tenant(
+        organization_name=organization_name,
+        organization_id=organization_id,
+        superuser_email=superuser_email,
+        head_email=head_email,
+        member_email=member_email,
+        project_id=project["project_id"],
+        head_member_id=head_member_id,
+        member_id=member_id,
+        superuser=superuser,
+        head=head,
+        member=await login(client, member_email),
+    )
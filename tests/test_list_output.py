@@ -0,0 +1,99 @@
+"""List endpoints serve column-projected rows in the ``*Out`` shape.
+
+The rows are dumped through a ``TypeAdapter`` without building ORM objects
+or validating each row, so these tests pin the JSON they produce against
+the response models and the single-item endpoints.
+"""
+import pytest
+from conftest import requires_postgres
+
+requires_postgres()
+
+from app.core.pagination import NEXT_CURSOR_HEADER  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.schemas.project import ProjectOut  # noqa: E402
+from app.schemas.task import TaskOut  # noqa: E402
+from app.schemas.team import TeamMemberOut  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+
+def assert_rows_match(rows: list[dict], model) -> None:
+    assert rows
+    for row in rows:
+        assert list(row) == list(model.model_fields)
+        assert model.model_validate(row).model_dump(mode="json") == row
+
+
+async def test_list_rows_have_the_response_model_shape(client, tenant):
+    response = await client.get("/api/projects/", headers=tenant.head)
+    assert response.status_code == 200, response.text
+    assert_rows_match(response.json(), ProjectOut)
+
+    response = await client.get(
+        f"/api/projects/{tenant.project_id}/tasks/", headers=tenant.head
+    )
+    assert response.status_code == 200, response.text
+    assert_rows_match(response.json(), TaskOut)
+
+    response = await client.get("/api/teams/", headers=tenant.head)
+    assert response.status_code == 200, response.text
+    assert_rows_match(response.json(), TeamMemberOut)
+    assert {row["organization_name"] for row in response.json()} == {
+        tenant.organization_name
+    }
+
+
+async def test_listed_task_equals_created_task(client, tenant):
+    tasks = f"/api/projects/{tenant.project_id}/tasks/"
+    response = await client.post(
+        tasks,
+        headers=tenant.head,
+        json={
+            "task_description": "Listed",
+            "task_deadline": "2026-12-24",
+            "task_assigned_to": tenant.member_id,
+            "task_importance": "low",
+        },
+    )
+    assert response.status_code == 201, response.text
+    created = response.json()
+
+    response = await client.get(tasks, headers=tenant.head, params={"importance": "low"})
+    assert response.status_code == 200, response.text
+    assert created in response.json()
+
+
+async def test_pages_add_up_to_the_whole_list(client, tenant):
+    tasks = f"/api/projects/{tenant.project_id}/tasks/"
+    whole = (await client.get(tasks, headers=tenant.head)).json()
+
+    rows, params = [], {"limit": 2}
+    while True:
+        response = await client.get(tasks, headers=tenant.head, params=params)
+        assert response.status_code == 200, response.text
+        assert len(response.json()) <= 2
+        rows.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert rows == whole
+
+
+async def test_lists_skip_per_row_validation(client, tenant, monkeypatch):
+    def fail(cls, *args, **kwargs):
+        raise AssertionError(f"{cls.__name__}.model_validate called for a list row")
+
+    for model in (ProjectOut, TaskOut, TeamMemberOut):
+        monkeypatch.setattr(model, "model_validate", classmethod(fail))
+    response_cache.clear_local()
+
+    for path in (
+        "/api/projects/",
+        f"/api/projects/{tenant.project_id}/tasks/",
+        "/api/teams/",
+    ):
+        response = await client.get(path, headers=tenant.head)
+        assert response.status_code == 200, response.text
+        assert response.json()
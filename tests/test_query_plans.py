@@ -0,0 +1,216 @@
+"""EXPLAIN regression suite for the tenancy hot-path reads.
+
+Each case runs a CRUD reader on the seeded tenant, captures the SQL it sent
+and EXPLAINs it with sequential scans disabled. The seeded tables are tiny,
+so the planner would otherwise pick a sequential scan for everything; with
+``enable_seqscan`` off it still falls back to one only when no index can
+serve the query, which is the regression this suite guards against.
+
+Task reads are also checked for partition pruning: the plan must touch a
+single ``tasks_pN`` partition, the organization's. Single-row lookups must
+be answered by an index condition alone: a primary key that merely leads
+with ``organization_id`` avoids the sequential scan, but then filters every
+row of the organization. The same holds for the lookup Postgres runs on
+``tasks`` for ``tasks_assignee_fk`` before a team member row is deleted.
+"""
+import json
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterator
+
+import pytest
+from conftest import requires_postgres
+from sqlalchemy import event, text
+
+requires_postgres()
+
+from app.crud.export import stream_export_rows  # noqa: E402
+from app.crud.project import get_projects_page  # noqa: E402
+from app.crud.sync import get_changes_page  # noqa: E402
+from app.crud.task import get_tasks_page  # noqa: E402
+from app.crud.team import (  # noqa: E402
+    get_organization_head,
+    get_team_member_by_user_id,
+    get_team_members_page,
+)
+from app.crud.user import get_user_by_email  # noqa: E402
+from app.database.session import AsyncSessionLocal, engine  # noqa: E402
+from app.dependencies.tenancy import load_principal  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+Query = Callable[[Any, Any], Awaitable[Any]]
+
+
+@contextmanager
+def captured_statements() -> Iterator[list[tuple[str, Any]]]:
+    """Collect ``(sql, parameters)`` for every statement sent on the primary engine."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(statement: str, parameters: Any) -> dict:
+    """The plan Postgres would use for these parameter values, as JSON."""
+    async with AsyncSessionLocal() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        # Plan for the actual values (as the first executions of a prepared
+        # statement do), so partition pruning shows up at plan time.
+        await conn.exec_driver_sql("SET LOCAL plan_cache_mode = force_custom_plan")
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        document = result.scalar_one()
+        await db.rollback()
+    if isinstance(document, str):
+        document = json.loads(document)
+    return document[0]["Plan"]
+
+
+async def plans_of(query: Query, tenant) -> list[dict]:
+    async with AsyncSessionLocal() as db:
+        with captured_statements() as statements:
+            await query(db, tenant)
+    assert statements, "the query sent no SQL"
+    return [await explain(statement, parameters) for statement, parameters in statements]
+
+
+async def _changes(db, tenant, resource: str) -> None:
+    await get_changes_page(
+        db, tenant.organization_id, resource, since=0, until=2**62, limit=50
+    )
+
+
+async def _export(db, tenant, resource: str) -> None:
+    async for _ in stream_export_rows(db, tenant.organization_id, resource, batch_size=100):
+        pass
+
+
+async def _membership_by_user(db, tenant) -> None:
+    user = await get_user_by_email(db, tenant.head_email)
+    await get_team_member_by_user_id(db, user.id)
+
+
+QUERIES: dict[str, Query] = {
+    "projects page": lambda db, t: get_projects_page(db, t.organization_id, limit=50),
+    "tasks page": lambda db, t: get_tasks_page(
+        db, t.organization_id, t.project_id, limit=50
+    ),
+    "tasks page by assignee": lambda db, t: get_tasks_page(
+        db, t.organization_id, t.project_id, limit=50, assigned_to=t.member_id
+    ),
+    "tasks page by deadline": lambda db, t: get_tasks_page(
+        db, t.organization_id, t.project_id, limit=50, sort="deadline"
+    ),
+    "tasks page by importance": lambda db, t: get_tasks_page(
+        db, t.organization_id, t.project_id, limit=50, sort="importance", completed=False
+    ),
+    "team page": lambda db, t: get_team_members_page(db, t.organization_id, limit=50),
+    "principal": lambda db, t: load_principal(db, t.head_email),
+    "membership by user": _membership_by_user,
+    "organization head": lambda db, t: get_organization_head(db, t.organization_id),
+    **{
+        f"changes of {resource}": partial(_changes, resource=resource)
+        for resource in ("projects", "tasks", "members", "deleted")
+    },
+    **{
+        f"export of {resource}": partial(_export, resource=resource)
+        for resource in ("projects", "tasks", "teams")
+    },
+}
+
+
+@pytest.mark.parametrize("name", QUERIES)
+async def test_query_uses_indexes(name, tenant):
+    for plan in await plans_of(QUERIES[name], tenant):
+        seq_scans = [
+            node["Relation Name"]
+            for node in plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+        ]
+        assert not seq_scans, f"{name}: sequential scan on {seq_scans}"
+
+
+def filtered_scans(plan: dict) -> list[str]:
+    """Relations whose rows are filtered after the index lookup."""
+    return [
+        node["Relation Name"]
+        for node in plan_nodes(plan)
+        if "Relation Name" in node and "Filter" in node
+    ]
+
+
+LOOKUPS = ["principal", "membership by user", "organization head"]
+
+
+@pytest.mark.parametrize("name", LOOKUPS)
+async def test_lookup_is_an_index_condition(name, tenant):
+    for plan in await plans_of(QUERIES[name], tenant):
+        assert not filtered_scans(plan), f"{name}: filters rows of {filtered_scans(plan)}"
+
+
+@pytest.mark.parametrize("name", [name for name in QUERIES if "task" in name])
+async def test_task_query_reads_one_partition(name, tenant):
+    for plan in await plans_of(QUERIES[name], tenant):
+        partitions = {
+            node["Relation Name"]
+            for node in plan_nodes(plan)
+            if node.get("Relation Name", "").startswith("tasks_p")
+        }
+        assert len(partitions) == 1, f"{name}: scans partitions {sorted(partitions)}"
+
+
+# What the RESTRICT trigger of tasks_assignee_fk runs when a teams row is
+# deleted (see ri_triggers.c); it is not sent by the application.
+ASSIGNEE_FK_CHECK = (
+    "SELECT 1 FROM tasks x WHERE organization_id = $1 AND task_assigned_to = $2"
+    " FOR KEY SHARE OF x"
+)
+
+
+async def leading_columns(index_name: str, count: int) -> list[str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            text(
+                "SELECT a.attname FROM pg_index i"
+                " CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, n)"
+                " JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum"
+                " WHERE i.indexrelid = CAST(:index AS regclass) ORDER BY k.n LIMIT :count"
+            ),
+            {"index": index_name, "count": count},
+        )
+        return list(result.scalars())
+
+
+async def test_member_delete_check_uses_an_index(tenant):
+    plan = await explain(ASSIGNEE_FK_CHECK, (tenant.organization_id, tenant.member_id))
+    nodes = list(plan_nodes(plan))
+    # An index with project_id in between would serve it too, by reading
+    # every entry of the organization.
+    for node in nodes:
+        if "Index Name" in node:
+            assert await leading_columns(node["Index Name"], 2) == [
+                "organization_id",
+                "task_assigned_to",
+            ], f"assignee check: uses {node['Index Name']}"
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert not seq_scans, f"assignee check: sequential scan on {seq_scans}"
+    assert not filtered_scans(plan), f"assignee check: filters rows of {filtered_scans(plan)}"
+    partitions = {
+        node["Relation Name"]
+        for node in nodes
+        if node.get("Relation Name", "").startswith("tasks_p")
+    }
+    assert len(partitions) == 1, f"assignee check: scans partitions {sorted(partitions)}"
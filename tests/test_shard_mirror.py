@@ -0,0 +1,71 @@
+"""A failed membership mirror is reported once the directory write has committed."""
+import os
+import uuid
+
+import pytest
+from conftest import PASSWORD, requires_postgres
+
+requires_postgres()
+
+from app.core.config import settings  # noqa: E402
+from app.database import shards  # noqa: E402
+from app.routers import superuser  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def failing_mirror(monkeypatch):
+    async def fail(organization_id: int, shard: str) -> None:
+        raise ConnectionRefusedError(f"shard {shard!r} is down")
+
+    monkeypatch.setattr(shards, "mirror_membership", fail)
+
+
+def new_email() -> str:
+    return f"mirrored-{uuid.uuid4().hex[:8]}@example.com"
+
+
+async def test_create_organization_reports_the_mirror_command(
+    client, tenant, failing_mirror, monkeypatch
+):
+    monkeypatch.setattr(superuser, "place_new_organization", lambda name: "mirrored")
+    monkeypatch.setitem(settings.DATABASE_SHARDS, "mirrored", os.environ["DATABASE_URL"])
+    head_email = new_email()
+    response = await client.post(
+        "/api/auth/signup", json={"email": head_email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+
+    name = f"Mirrored {uuid.uuid4().hex[:8]}"
+    payload = {"organization_name": name, "head_email": head_email, "head_name": "Head"}
+    response = await client.post(
+        "/api/superuser/organizations/", headers=tenant.superuser, json=payload
+    )
+    assert response.status_code == 503, response.text
+    assert f'python -m app.database.shards mirror "{name}"' in response.json()["detail"]
+
+    # The organization was created: retrying is not the fix.
+    response = await client.post(
+        "/api/superuser/organizations/", headers=tenant.superuser, json=payload
+    )
+    assert response.status_code == 409, response.text
+
+
+async def test_add_member_reports_the_mirror_command(client, tenant, failing_mirror):
+    email = new_email()
+    response = await client.post(
+        "/api/auth/signup", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+
+    response = await client.post(
+        "/api/teams/", headers=tenant.head, json={"name": "Mirrored", "email": email}
+    )
+    assert response.status_code == 503, response.text
+    assert (
+        f'python -m app.database.shards mirror "{tenant.organization_name}"'
+        in response.json()["detail"]
+    )
+    team = (await client.get("/api/teams/", headers=tenant.head)).json()
+    assert email in {row["email"] for row in team}
@@ -0,0 +1,64 @@
+"""Adding a member answers a 409 naming the membership rule it broke."""
+import uuid
+
+import pytest
+from conftest import PASSWORD, requires_postgres
+
+requires_postgres()
+
+from app.crud.team import MEMBER_CONFLICTS  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+
+async def signup(client) -> str:
+    email = f"conflict-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post(
+        "/api/auth/signup", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return email
+
+
+async def test_duplicate_email_in_the_organization(client, tenant):
+    response = await client.post(
+        "/api/teams/",
+        headers=tenant.head,
+        json={"name": "Again", "email": tenant.member_email},
+    )
+    assert response.status_code == 409, response.text
+    assert response.json()["detail"] == MEMBER_CONFLICTS["teams_org_email_unique"]
+
+
+async def test_member_of_another_organization(client, tenant):
+    head_email = await signup(client)
+    response = await client.post(
+        "/api/superuser/organizations/",
+        headers=tenant.superuser,
+        json={
+            "organization_name": f"Other {uuid.uuid4().hex[:8]}",
+            "head_email": head_email,
+            "head_name": "Other head",
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    response = await client.post(
+        "/api/teams/", headers=tenant.head, json={"name": "Taken", "email": head_email}
+    )
+    assert response.status_code == 409, response.text
+    assert response.json()["detail"] == MEMBER_CONFLICTS["teams_user_id_unique"]
+
+
+async def test_second_head(client, tenant):
+    email = await signup(client)
+    response = await client.post(
+        "/api/teams/",
+        headers=tenant.head,
+        json={"name": "Second head", "email": email, "position": "head"},
+    )
+    assert response.status_code == 409, response.text
+    assert response.json()["detail"] == MEMBER_CONFLICTS["teams_one_head_per_org"]
+
+    team = (await client.get("/api/teams/", headers=tenant.head)).json()
+    assert [row["email"] for row in team if row["position"] == "head"] == [tenant.head_email]
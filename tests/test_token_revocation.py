@@ -0,0 +1,94 @@
+"""Org-scoped token claims stop being trusted once their user's tokens are revoked."""
+import asyncio
+import uuid
+
+import pytest
+from conftest import PASSWORD, login, requires_postgres
+
+requires_postgres()
+
+from app.core import revocation  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.dependencies import auth  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def org_claims(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ORG_CLAIMS_ENABLED", True)
+    # iat has one-second resolution; a shorter grace keeps the test quick.
+    monkeypatch.setattr(revocation.token_revocations, "grace_seconds", 0.0)
+
+
+def test_table_tracks_the_latest_revocation():
+    table = revocation.TokenRevocationTable(
+        refresh_seconds=30, grace_seconds=5, lifetime_seconds=3600
+    )
+    assert table.is_stale()
+    table.merge({1: 1000.0}, refreshed_at=2000.0)
+    table.revoke({1: 900.0, 2: 1500.0})
+    assert not table.is_trusted(1, 1004.0)
+    assert table.is_trusted(1, 1006.0)
+    assert not table.is_trusted(2, 1200.0)
+    assert table.is_trusted(3, 0.0)
+
+    # Entries older than a token's lifetime can no longer match one.
+    table.merge({}, refreshed_at=1000.0 + 3600 + 6)
+    assert table.stats()["tracked_users"] == 1
+
+
+async def test_joining_revokes_org_less_claims(client, tenant, org_claims):
+    email = f"joiner-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post(
+        "/api/auth/signup", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    before = await login(client, email)
+    response = await client.get("/api/projects/", headers=before)
+    assert response.status_code == 403, response.text
+
+    response = await client.post(
+        "/api/teams/", headers=tenant.head, json={"name": "Joiner", "email": email}
+    )
+    assert response.status_code == 201, response.text
+
+    revoked = revocation.token_revocations.revoked
+    response = await client.get("/api/projects/", headers=before)
+    assert response.status_code == 200, response.text
+    assert revocation.token_revocations.revoked == revoked + 1
+
+    await asyncio.sleep(1.1)
+    after = await login(client, email)
+    accepted = revocation.token_revocations.accepted
+    response = await client.get("/api/projects/", headers=after)
+    assert response.status_code == 200, response.text
+    assert revocation.token_revocations.accepted == accepted + 1
+
+
+async def test_refresh_reads_recent_revocations(client, tenant, org_claims, monkeypatch):
+    token = await login(client, tenant.member_email)
+    await asyncio.sleep(1.1)
+    response = await client.patch(
+        f"/api/superuser/organizations/{tenant.organization_name}/head",
+        headers=tenant.superuser,
+        json={"new_head_email": tenant.member_email},
+    )
+    assert response.status_code == 200, response.text
+    try:
+        # A worker that missed the change finds it in the database.
+        table = revocation.TokenRevocationTable(
+            refresh_seconds=30, grace_seconds=0.0, lifetime_seconds=3600
+        )
+        monkeypatch.setattr(auth, "token_revocations", table)
+        response = await client.get("/api/projects/", headers=token)
+        assert response.status_code == 200, response.text
+        stats = table.stats()
+        assert (stats["refreshes"], stats["accepted"], stats["revoked"]) == (1, 0, 1)
+    finally:
+        response = await client.patch(
+            f"/api/superuser/organizations/{tenant.organization_name}/head",
+            headers=tenant.superuser,
+            json={"new_head_email": tenant.head_email},
+        )
+        assert response.status_code == 200, response.text
@@ -0,0 +1,245 @@
+"""Statements and transactions per mutating endpoint.
+
+Every write endpoint runs its reads and writes in one transaction built on
+INSERT/UPDATE ... RETURNING. These tests record what each request sends on
+the primary engine and pin the writing transaction's statements, so an
+extra round trip or a second commit shows up as a failure.
+"""
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import pytest
+from conftest import requires_postgres
+from sqlalchemy import event
+
+requires_postgres()
+
+from app.core.cache import principal_cache  # noqa: E402
+from app.database.session import AsyncSessionLocal, engine  # noqa: E402
+from app.dependencies.tenancy import load_principal  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+_TOKENS = re.compile(r"[()]|\bFROM\s+(\w+)")
+
+
+def statement_kind(statement: str) -> str:
+    """``"UPDATE projects"``, ``"SELECT pg_notify"`` and so on.
+
+    A SELECT is named after its top-level FROM, not a scalar subquery's.
+    """
+    words = statement.split()
+    verb = words[0].upper()
+    if verb in {"INSERT", "DELETE"}:
+        return f"{verb} {words[2]}"
+    if verb == "UPDATE":
+        return f"{verb} {words[1]}"
+    if verb == "SELECT" and words[1].startswith("pg_notify"):
+        return "SELECT pg_notify"
+    depth = 0
+    for match in _TOKENS.finditer(statement):
+        if match.group(0) == "(":
+            depth += 1
+        elif match.group(0) == ")":
+            depth -= 1
+        elif depth == 0:
+            return f"{verb} {match.group(1)}"
+    return verb
+
+
+@dataclass
+class Transaction:
+    statements: list[str] = field(default_factory=list)
+    committed: bool = False
+
+    @property
+    def kinds(self) -> list[str]:
+        return [statement_kind(statement) for statement in self.statements]
+
+    @property
+    def wrote(self) -> bool:
+        return any(kind.split()[0] in {"INSERT", "UPDATE", "DELETE"} for kind in self.kinds)
+
+
+@contextmanager
+def recorded_transactions() -> Iterator[list[Transaction]]:
+    """Every transaction run on the primary engine inside the block, in order."""
+    transactions: list[Transaction] = []
+    current: dict[int, Transaction] = {}
+
+    def begin(conn):
+        current[id(conn)] = Transaction()
+        transactions.append(current[id(conn)])
+
+    def execute(conn, cursor, statement, parameters, context, executemany):
+        if id(conn) not in current:
+            begin(conn)
+        current[id(conn)].statements.append(statement)
+
+    def commit(conn):
+        current.pop(id(conn)).committed = True
+
+    def rollback(conn):
+        current.pop(id(conn), None)
+
+    listeners = [
+        ("begin", begin),
+        ("before_cursor_execute", execute),
+        ("commit", commit),
+        ("rollback", rollback),
+    ]
+    for name, listener in listeners:
+        event.listen(engine.sync_engine, name, listener)
+    try:
+        yield transactions
+    finally:
+        for name, listener in listeners:
+            event.remove(engine.sync_engine, name, listener)
+
+
+async def warm_principal(email: str) -> None:
+    """Cache the caller's principal so its lookup is not part of the count."""
+    async with AsyncSessionLocal() as db:
+        principal_cache.set(email, await load_principal(db, email))
+
+
+async def assert_one_write(request, email: str, expected: list[str]):
+    """Send ``request`` and check it ran ``expected`` in its only transaction."""
+    await warm_principal(email)
+    with recorded_transactions() as transactions:
+        response = await request
+    assert response.status_code < 400, response.text
+    writes = [transaction for transaction in transactions if transaction.wrote]
+    assert len(writes) == 1, [transaction.kinds for transaction in transactions]
+    assert writes[0].committed
+    assert writes[0].kinds == expected
+    assert sum(len(transaction.statements) for transaction in transactions) == len(expected)
+    return response
+
+
+async def test_project_writes(client, tenant):
+    response = await assert_one_write(
+        client.post("/api/projects/", headers=tenant.head, json={"project_name": "Counted"}),
+        tenant.head_email,
+        ["UPDATE organizations", "INSERT projects", "SELECT pg_notify"],
+    )
+    project_id = response.json()["project_id"]
+    await assert_one_write(
+        client.patch(
+            f"/api/projects/{project_id}",
+            headers=tenant.head,
+            json={"project_description": "Counted writes"},
+        ),
+        tenant.head_email,
+        ["UPDATE organizations", "UPDATE projects", "SELECT pg_notify"],
+    )
+    await assert_one_write(
+        client.delete(f"/api/projects/{project_id}", headers=tenant.head),
+        tenant.head_email,
+        ["UPDATE organizations", "DELETE projects", "INSERT tombstones", "SELECT pg_notify"],
+    )
+
+
+async def test_task_writes(client, tenant):
+    tasks = f"/api/projects/{tenant.project_id}/tasks"
+    response = await assert_one_write(
+        client.post(
+            f"{tasks}/",
+            headers=tenant.head,
+            json={
+                "task_description": "Counted",
+                "task_assigned_to": tenant.member_id,
+                "task_importance": "medium",
+            },
+        ),
+        tenant.head_email,
+        ["UPDATE organizations", "INSERT tasks", "UPDATE projects", "SELECT pg_notify"],
+    )
+    task_id = response.json()["task_id"]
+    await assert_one_write(
+        client.patch(
+            f"{tasks}/{task_id}", headers=tenant.head, json={"task_importance": "high"}
+        ),
+        tenant.head_email,
+        ["UPDATE organizations", "UPDATE tasks", "UPDATE projects", "SELECT pg_notify"],
+    )
+    await assert_one_write(
+        client.patch(
+            f"{tasks}/{task_id}/complete",
+            headers=tenant.member,
+            json={"task_completed": True},
+        ),
+        tenant.member_email,
+        ["UPDATE organizations", "UPDATE tasks", "UPDATE projects", "SELECT pg_notify"],
+    )
+    await assert_one_write(
+        client.delete(f"{tasks}/{task_id}", headers=tenant.head),
+        tenant.head_email,
+        [
+            "UPDATE organizations",
+            "DELETE tasks",
+            "UPDATE projects",
+            "INSERT tombstones",
+            "SELECT pg_notify",
+        ],
+    )
+
+
+async def test_bulk_task_writes(client, tenant):
+    tasks = f"/api/projects/{tenant.project_id}/tasks"
+    response = await assert_one_write(
+        client.post(
+            f"{tasks}:bulk",
+            headers=tenant.head,
+            json={
+                "tasks": [
+                    {"task_description": f"Bulk {index}", "task_assigned_to": tenant.member_id}
+                    for index in range(3)
+                ]
+            },
+        ),
+        tenant.head_email,
+        [
+            "SELECT projects",
+            "SELECT teams",
+            "UPDATE organizations",
+            "INSERT tasks",
+            "UPDATE projects",
+            "SELECT pg_notify",
+        ],
+    )
+    await assert_one_write(
+        client.patch(
+            f"{tasks}:bulk",
+            headers=tenant.head,
+            json={
+                "task_ids": response.json()["task_ids"],
+                "changes": {"task_importance": "low"},
+            },
+        ),
+        tenant.head_email,
+        ["UPDATE organizations", "UPDATE tasks", "UPDATE projects", "SELECT pg_notify"],
+    )
+
+
+async def test_add_team_member(client, tenant):
+    email = f"counted-{tenant.organization_id}@example.com"
+    response = await client.post(
+        "/api/auth/signup", json={"email": email, "password": "password123"}
+    )
+    assert response.status_code == 200, response.text
+    await assert_one_write(
+        client.post(
+            "/api/teams/", headers=tenant.head, json={"name": "Counted", "email": email}
+        ),
+        tenant.head_email,
+        [
+            "SELECT users",
+            "UPDATE organizations",
+            "INSERT teams",
+            "UPDATE users",
+            "SELECT pg_notify",
+        ],
+    )
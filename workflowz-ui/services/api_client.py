@@ -6,17 +6,29 @@ from typing import Any
 import httpx
 
 from utils.config import get_api_base_url
-from utils.state import get_access_token, logout
+from utils.state import (
+    get_access_token,
+    get_etag_cache,
+    get_write_lsn,
+    logout,
+    set_write_lsn,
+)
 
 
 class ApiError(Exception):
     pass
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+ETAG_HEADER = "ETag"
+WRITE_LSN_HEADER = "X-Write-LSN"
+
+
 @dataclass
 class ApiResponse:
     status_code: int
     data: Any
+    next_cursor: str | None = None
 
 
 class APIClient:
@@ -28,6 +40,10 @@ class APIClient:
         headers = {"Accept": "application/json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
+        # Keeps our reads on the primary until a replica has our last write.
+        write_lsn = get_write_lsn()
+        if write_lsn:
+            headers[WRITE_LSN_HEADER] = write_lsn
         return headers
 
     def _handle_response(self, response: httpx.Response) -> ApiResponse:
@@ -41,8 +57,14 @@ class APIClient:
             except Exception:
                 detail = response.text
             raise ApiError(detail)
+        if response.headers.get(WRITE_LSN_HEADER):
+            set_write_lsn(response.headers[WRITE_LSN_HEADER])
         data = response.json() if response.content else None
-        return ApiResponse(status_code=response.status_code, data=data)
+        return ApiResponse(
+            status_code=response.status_code,
+            data=data,
+            next_cursor=response.headers.get(NEXT_CURSOR_HEADER),
+        )
 
     def get(self, path: str, params: dict | None = None) -> ApiResponse:
         url = f"{self.base_url}{path}"
@@ -50,6 +72,36 @@ class APIClient:
             response = client.get(url, headers=self._headers(), params=params)
         return self._handle_response(response)
 
+    def get_all(self, path: str, params: dict | None = None) -> list:
+        """GET a keyset-paginated list endpoint, following cursors to the last page.
+
+        Pages are revalidated with ``If-None-Match``; a ``304`` reuses the copy
+        kept in the session instead of downloading the body again.
+        """
+        url = f"{self.base_url}{path}"
+        page_params = dict(params or {})
+        items: list = []
+        etag_cache = get_etag_cache()
+        with httpx.Client(timeout=30.0, follow_redirects=True) as client:
+            while True:
+                key = (path, tuple(sorted(page_params.items())))
+                cached = etag_cache.get(key)
+                headers = self._headers()
+                if cached:
+                    headers["If-None-Match"] = cached[0]
+                raw = client.get(url, headers=headers, params=page_params)
+                if raw.status_code == 304 and cached:
+                    _, data, next_cursor = cached
+                else:
+                    response = self._handle_response(raw)
+                    data, next_cursor = response.data, response.next_cursor
+                    if raw.headers.get(ETAG_HEADER):
+                        etag_cache[key] = (raw.headers[ETAG_HEADER], data, next_cursor)
+                items.extend(data or [])
+                if not next_cursor:
+                    return items
+                page_params["cursor"] = next_cursor
+
     def post(
         self,
         path: str,
@@ -4,7 +4,7 @@ from services.api_client import APIClient
 def list_projects(organization_name: str | None = None) -> list[dict]:
     client = APIClient()
     params = {"organization_name": organization_name} if organization_name else None
-    return client.get("/api/projects", params=params).data or []
+    return client.get_all("/api/projects", params=params)
 
 
 def create_project(
@@ -1,9 +1,9 @@
 from services.api_client import APIClient
 
 
-def list_organizations() -> list[dict]:
+def list_organizations(sort: str = "name") -> list[dict]:
     client = APIClient()
-    return client.get("/api/superuser/organizations/").data or []
+    return client.get_all("/api/superuser/organizations/", params={"sort": sort})
 
 
 def create_organization(payload: dict) -> dict:
@@ -2,11 +2,16 @@ from services.api_client import APIClient
 
 
 def list_tasks(
-    project_id: int, organization_name: str | None = None
+    project_id: int,
+    organization_name: str | None = None,
+    filters: dict | None = None,
 ) -> list[dict]:
+    """List tasks; ``filters`` maps to the API's assigned_to/completed/importance/
+    deadline_from/deadline_to/sort query parameters."""
     client = APIClient()
-    params = {"organization_name": organization_name} if organization_name else None
-    return client.get(f"/api/projects/{project_id}/tasks", params=params).data or []
+    params = {"organization_name": organization_name} if organization_name else {}
+    params.update({key: value for key, value in (filters or {}).items() if value is not None})
+    return client.get_all(f"/api/projects/{project_id}/tasks", params=params)
 
 
 def create_task(project_id: int, payload: dict, organization_name: str | None = None) -> dict:
@@ -19,6 +24,32 @@ def create_task(project_id: int, payload: dict, organization_name: str | None =
     ).data
 
 
+def create_tasks_bulk(
+    project_id: int, tasks: list[dict], organization_name: str | None = None
+) -> dict:
+    """Persist many tasks (e.g. an AI-generated plan) in one request."""
+    client = APIClient()
+    params = {"organization_name": organization_name} if organization_name else None
+    return client.post(
+        f"/api/projects/{project_id}/tasks:bulk",
+        json={"tasks": tasks},
+        params=params,
+    ).data
+
+
+def update_tasks_bulk(
+    project_id: int, payload: dict, organization_name: str | None = None
+) -> dict:
+    """Apply ``payload["changes"]`` to tasks picked by ``task_ids`` and/or ``filter``."""
+    client = APIClient()
+    params = {"organization_name": organization_name} if organization_name else None
+    return client.patch(
+        f"/api/projects/{project_id}/tasks:bulk",
+        json=payload,
+        params=params,
+    ).data
+
+
 def update_task(
     project_id: int, task_id: int, payload: dict, organization_name: str | None = None
 ) -> dict:
@@ -40,6 +40,22 @@ def set_auth_session(token: str) -> None:
 def logout() -> None:
     st.session_state["access_token"] = None
     st.session_state["user_context"] = None
+    st.session_state["etag_cache"] = {}
+    st.session_state["write_lsn"] = None
+
+
+def get_etag_cache() -> dict:
+    """Last ETag, body and next cursor per list page, for ``If-None-Match`` requests."""
+    return st.session_state.setdefault("etag_cache", {})
+
+
+def get_write_lsn() -> str | None:
+    return st.session_state.get("write_lsn")
+
+
+def set_write_lsn(lsn: str) -> None:
+    """Remember the API's WAL position after our last write (read-your-writes)."""
+    st.session_state["write_lsn"] = lsn
 
 
 def get_access_token() -> str | None: